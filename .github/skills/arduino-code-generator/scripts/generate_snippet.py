@@ -18,62 +18,239 @@ Usage:
 """
 
 import argparse
+import string
 import sys
 from dataclasses import dataclass
-from typing import Optional
+from functools import lru_cache
+from pathlib import Path
+from types import MappingProxyType
+from typing import Mapping
 
 # =============================================================================
 # Board Configurations
 # =============================================================================
 
+@dataclass(frozen=True, slots=True)
+class BoardConfig:
+    """Pin and peripheral defaults for a supported board"""
+    name: str
+    define: str
+    led: int
+    button: int
+    sda: int | str  # UNO uses analog pin names
+    scl: int | str
+    sram: int
+    baud: int
+    adc_bits: int
+    has_wifi: bool
+    uses_progmem: bool  # AVR: const tables must be placed in flash explicitly
+
+
 BOARD_CONFIGS = {
-    "uno": {
-        "name": "Arduino UNO",
-        "define": "ARDUINO_AVR_UNO",
-        "led": 13,
-        "button": 2,
-        "sda": "A4",
-        "scl": "A5",
-        "sram": 2048,
-        "baud": 9600,
-        "adc_bits": 10,
-        "has_wifi": False,
-    },
-    "esp32": {
-        "name": "ESP32",
-        "define": "ESP32",
-        "led": 2,
-        "button": 4,
-        "sda": 21,
-        "scl": 22,
-        "sram": 520000,
-        "baud": 115200,
-        "adc_bits": 12,
-        "has_wifi": True,
-    },
-    "rp2040": {
-        "name": "RP2040",
-        "define": "ARDUINO_ARCH_RP2040",
-        "led": 25,
-        "button": 14,
-        "sda": 4,
-        "scl": 5,
-        "sram": 264000,
-        "baud": 115200,
-        "adc_bits": 12,
-        "has_wifi": False,
-    },
+    "uno": BoardConfig(
+        name="Arduino UNO",
+        define="ARDUINO_AVR_UNO",
+        led=13,
+        button=2,
+        sda="A4",
+        scl="A5",
+        sram=2048,
+        baud=9600,
+        adc_bits=10,
+        has_wifi=False,
+        uses_progmem=True,
+    ),
+    "esp32": BoardConfig(
+        name="ESP32",
+        define="ESP32",
+        led=2,
+        button=4,
+        sda=21,
+        scl=22,
+        sram=520000,
+        baud=115200,
+        adc_bits=12,
+        has_wifi=True,
+        uses_progmem=False,
+    ),
+    "rp2040": BoardConfig(
+        name="RP2040",
+        define="ARDUINO_ARCH_RP2040",
+        led=25,
+        button=14,
+        sda=4,
+        scl=5,
+        sram=264000,
+        baud=115200,
+        adc_bits=12,
+        has_wifi=False,
+        uses_progmem=False,
+    ),
 }
 
+# =============================================================================
+# Shared Template Fragments
+# =============================================================================
+
+# EveryMs is used by several patterns; it is spliced into each template that
+# needs it so the generated sketch compiles on its own.
+_EVERY_MS_CLASS = '''class EveryMs {{
+private:
+  unsigned long interval;
+  unsigned long lastTrigger;
+  
+public:
+  EveryMs(unsigned long ms) : interval(ms), lastTrigger(0) {{}}
+  
+  bool check() {{
+    unsigned long now = millis();
+    // Handles millis() overflow correctly (unsigned subtraction)
+    if (now - lastTrigger >= interval) {{
+      lastTrigger = now;
+      return true;
+    }}
+    return false;
+  }}
+  
+  void reset() {{
+    lastTrigger = millis();
+  }}
+  
+  void setInterval(unsigned long ms) {{
+    interval = ms;
+  }}
+  
+  unsigned long elapsed() const {{
+    return millis() - lastTrigger;
+  }}
+}};
+'''
+
+CRC8_POLY = 0x31
+
+_CRC8_BITWISE = """// === CRC8 for data validation ===
+uint8_t crc8(const uint8_t* data, size_t len) {
+  uint8_t crc = 0xFF;
+  while (len--) {
+    crc ^= *data++;
+    for (uint8_t i = 0; i < 8; i++) {
+      crc = (crc & 0x80) ? (crc << 1) ^ 0x31 : crc << 1;
+    }
+  }
+  return crc;
+}
+"""
+
+
+@lru_cache(maxsize=None)
+def _crc8_table(poly: int = CRC8_POLY) -> tuple:
+    """Build the 256-entry lookup table for an MSB-first CRC8 (once per poly)."""
+    table = []
+    for byte in range(256):
+        crc = byte
+        for _ in range(8):
+            crc = ((crc << 1) ^ poly) & 0xFF if crc & 0x80 else (crc << 1) & 0xFF
+        table.append(crc)
+    return tuple(table)
+
+
+@lru_cache(maxsize=None)
+def _crc8_source(fast: bool, uses_progmem: bool) -> str:
+    """C source for crc8(): bit-loop by default, table lookup when fast."""
+    if not fast:
+        return _CRC8_BITWISE
+
+    table = _crc8_table()
+    rows = ",\n".join(
+        "  " + ", ".join(f"0x{v:02X}" for v in table[i:i + 16])
+        for i in range(0, 256, 16)
+    )
+    storage = " PROGMEM" if uses_progmem else ""
+    lookup = "pgm_read_byte(&CRC8_TABLE[crc ^ *data++])" if uses_progmem else "CRC8_TABLE[crc ^ *data++]"
+    return (
+        f"// === CRC8 for data validation (table-driven, poly 0x{CRC8_POLY:02X}) ===\n"
+        f"const uint8_t CRC8_TABLE[256]{storage} = {{\n{rows}\n}};\n\n"
+        "uint8_t crc8(const uint8_t* data, size_t len) {\n"
+        "  uint8_t crc = 0xFF;\n"
+        "  while (len--) {\n"
+        f"    crc = {lookup};\n"
+        "  }\n"
+        "  return crc;\n"
+        "}\n"
+    )
+
+
+# Devices recognised by the I2C scanner; emitted sorted by address.
+I2C_DEVICES = [
+    (0x3C, "SSD1306 OLED"),
+    (0x3D, "SSD1306 OLED (alt)"),
+    (0x27, "LCD I2C (PCF8574)"),
+    (0x3F, "LCD I2C (PCF8574A)"),
+    (0x76, "BME280/BMP280"),
+    (0x77, "BME280/BMP280 (alt)"),
+    (0x68, "MPU6050/DS3231 RTC"),
+    (0x57, "AT24C32 EEPROM"),
+    (0x50, "AT24C256 EEPROM"),
+    (0x48, "ADS1115 ADC"),
+    (0x40, "INA219 Current Sensor"),
+    (0x29, "VL53L0X ToF Sensor"),
+    (0x39, "APDS9960 Gesture"),
+    (0x5A, "MLX90614 IR Temp"),
+]
+
+
+@lru_cache(maxsize=None)
+def _i2c_lookup_source(uses_progmem: bool) -> str:
+    """C source for KNOWN_DEVICES and a binary-search identifyDevice()."""
+    rows = ",\n".join(
+        f'  {{0x{addr:02X}, "{name}"}}' for addr, name in sorted(I2C_DEVICES)
+    )
+    if uses_progmem:
+        storage = " PROGMEM"
+        read_addr = "pgm_read_byte(&KNOWN_DEVICES[mid].address)"
+        read_name = "(const char*)pgm_read_ptr(&KNOWN_DEVICES[mid].name)"
+    else:
+        storage = ""
+        read_addr = "KNOWN_DEVICES[mid].address"
+        read_name = "KNOWN_DEVICES[mid].name"
+    return (
+        "// Known I2C device addresses (sorted for binary search)\n"
+        "struct I2CDevice {\n"
+        "  uint8_t address;\n"
+        "  const char* name;\n"
+        "};\n\n"
+        f"constexpr uint8_t KNOWN_COUNT = {len(I2C_DEVICES)};\n"
+        f"const I2CDevice KNOWN_DEVICES[KNOWN_COUNT]{storage} = {{\n{rows},\n}};\n\n"
+        "const char* identifyDevice(uint8_t address) {\n"
+        "  uint8_t lo = 0, hi = KNOWN_COUNT;\n"
+        "  while (lo < hi) {\n"
+        "    uint8_t mid = (lo + hi) / 2;\n"
+        f"    uint8_t midAddr = {read_addr};\n"
+        f"    if (midAddr == address) return {read_name};\n"
+        "    if (midAddr < address) lo = mid + 1; else hi = mid;\n"
+        "  }\n"
+        '  return "Unknown";\n'
+        "}\n"
+    )
+
+
 # =============================================================================
 # Pattern Templates
 # =============================================================================
 
+@dataclass(frozen=True, slots=True)
+class Pattern:
+    """Code pattern metadata and its str.format template"""
+    name: str
+    description: str
+    template: str
+
+
 PATTERNS = {
-    "config": {
-        "name": "Config.h Hardware Abstraction",
-        "description": "Multi-board configuration with conditional compilation",
-        "template": '''// config.h - Hardware abstraction layer
+    "config": Pattern(
+        name="Config.h Hardware Abstraction",
+        description="Multi-board configuration with conditional compilation",
+        template='''// config.h - Hardware abstraction layer
 #ifndef CONFIG_H
 #define CONFIG_H
 
@@ -117,11 +294,11 @@ PATTERNS = {
 
 #endif // CONFIG_H
 ''',
-    },
-    "buttons": {
-        "name": "Button Debouncing",
-        "description": "Debounced button with press/release/long-press detection",
-        "template": '''// DebouncedButton - Software debouncing with event detection
+    ),
+    "buttons": Pattern(
+        name="Button Debouncing",
+        description="Debounced button with press/release/long-press detection",
+        template='''// DebouncedButton - Software debouncing with event detection
 // Pin: {button_pin} (configured for INPUT_PULLUP)
 
 class DebouncedButton {{
@@ -218,48 +395,16 @@ void loop() {{
   }}
 }}
 ''',
-    },
-    "i2c": {
-        "name": "I2C Scanner & Diagnostics",
-        "description": "Scan I2C bus and identify connected devices",
-        "template": '''// I2C Scanner - Detect devices on the I2C bus
+    ),
+    "i2c": Pattern(
+        name="I2C Scanner & Diagnostics",
+        description="Scan I2C bus and identify connected devices",
+        template='''// I2C Scanner - Detect devices on the I2C bus
 // SDA: Pin {sda}, SCL: Pin {scl}
 
 #include <Wire.h>
 
-// Known I2C device addresses
-struct I2CDevice {{
-  uint8_t address;
-  const char* name;
-}};
-
-const I2CDevice KNOWN_DEVICES[] = {{
-  {{0x3C, "SSD1306 OLED"}},
-  {{0x3D, "SSD1306 OLED (alt)"}},
-  {{0x27, "LCD I2C (PCF8574)"}},
-  {{0x3F, "LCD I2C (PCF8574A)"}},
-  {{0x76, "BME280/BMP280"}},
-  {{0x77, "BME280/BMP280 (alt)"}},
-  {{0x68, "MPU6050/DS3231 RTC"}},
-  {{0x57, "AT24C32 EEPROM"}},
-  {{0x50, "AT24C256 EEPROM"}},
-  {{0x48, "ADS1115 ADC"}},
-  {{0x40, "INA219 Current Sensor"}},
-  {{0x29, "VL53L0X ToF Sensor"}},
-  {{0x39, "APDS9960 Gesture"}},
-  {{0x5A, "MLX90614 IR Temp"}},
-}};
-const uint8_t KNOWN_COUNT = sizeof(KNOWN_DEVICES) / sizeof(KNOWN_DEVICES[0]);
-
-const char* identifyDevice(uint8_t address) {{
-  for (uint8_t i = 0; i < KNOWN_COUNT; i++) {{
-    if (KNOWN_DEVICES[i].address == address) {{
-      return KNOWN_DEVICES[i].name;
-    }}
-  }}
-  return "Unknown";
-}}
-
+{i2c_lookup}
 void scanI2C() {{
   Serial.println(F("\\n=== I2C Scanner ==="));
   Serial.println(F("Scanning...\\n"));
@@ -313,44 +458,14 @@ void loop() {{
   scanI2C();
 }}
 ''',
-    },
-    "scheduler": {
-        "name": "Non-blocking Scheduler",
-        "description": "millis()-based timer for multi-tasking without delay()",
-        "template": '''// EveryMs - Non-blocking timer class
+    ),
+    "scheduler": Pattern(
+        name="Non-blocking Scheduler",
+        description="millis()-based timer for multi-tasking without delay()",
+        template='''// EveryMs - Non-blocking timer class
 // Replaces delay() with proper millis() timing
 
-class EveryMs {{
-private:
-  unsigned long interval;
-  unsigned long lastTrigger;
-  
-public:
-  EveryMs(unsigned long ms) : interval(ms), lastTrigger(0) {{}}
-  
-  bool check() {{
-    unsigned long now = millis();
-    // Handles millis() overflow correctly (unsigned subtraction)
-    if (now - lastTrigger >= interval) {{
-      lastTrigger = now;
-      return true;
-    }}
-    return false;
-  }}
-  
-  void reset() {{
-    lastTrigger = millis();
-  }}
-  
-  void setInterval(unsigned long ms) {{
-    interval = ms;
-  }}
-  
-  unsigned long elapsed() const {{
-    return millis() - lastTrigger;
-  }}
-}};
-
+''' + _EVERY_MS_CLASS + '''
 // === Multi-Task Example ===
 EveryMs ledTimer(500);      // Blink LED every 500ms
 EveryMs sensorTimer(2000);  // Read sensor every 2s
@@ -388,11 +503,11 @@ void loop() {{
   // Other non-blocking code can run here
 }}
 ''',
-    },
-    "csv": {
-        "name": "CSV Data Logger",
-        "description": "Structured CSV output for data logging and analysis",
-        "template": '''// CSV Logger - Structured data output for Serial/SD
+    ),
+    "csv": Pattern(
+        name="CSV Data Logger",
+        description="Structured CSV output for data logging and analysis",
+        template='''// CSV Logger - Structured data output for Serial/SD
 // Format: timestamp,sensor1,sensor2,...
 
 class CSVLogger {{
@@ -443,6 +558,8 @@ public:
   }}
 }};
 
+// === Non-blocking Timer ===
+''' + _EVERY_MS_CLASS + '''
 // === Usage Example ===
 CSVLogger logger;
 const char* FIELDS[] = {{"temp_c", "humidity", "light"}};
@@ -477,11 +594,11 @@ void loop() {{
 // 10000,22.3,45.8,498
 // 15000,23.1,44.9,521
 ''',
-    },
-    "filtering": {
-        "name": "ADC Filtering",
-        "description": "Moving average and median filters for noisy sensors",
-        "template": '''// Sensor Filters - Reduce noise from analog readings
+    ),
+    "filtering": Pattern(
+        name="ADC Filtering",
+        description="Moving average and median filters for noisy sensors",
+        template='''// Sensor Filters - Reduce noise from analog readings
 
 // === Moving Average Filter ===
 template<uint8_t SIZE>
@@ -540,6 +657,8 @@ public:
   }}
 }};
 
+// === Non-blocking Timer ===
+''' + _EVERY_MS_CLASS + '''
 // === Usage Example ===
 MovingAverageFilter<10> avgFilter;  // 10-sample average
 MedianFilter3 medFilter;            // 3-sample median
@@ -570,11 +689,11 @@ void loop() {{
   }}
 }}
 ''',
-    },
-    "state-machine": {
-        "name": "State Machine",
-        "description": "Enum-based FSM for complex behavior control",
-        "template": '''// State Machine - Enum-based finite state machine
+    ),
+    "state-machine": Pattern(
+        name="State Machine",
+        description="Enum-based FSM for complex behavior control",
+        template='''// State Machine - Enum-based finite state machine
 // Example: Traffic light controller
 
 enum class State {{
@@ -672,14 +791,16 @@ void loop() {{
   traffic.update();
 }}
 ''',
-    },
-    "hardware-detection": {
-        "name": "Hardware Detection",
-        "description": "Auto-detect board type and connected sensors",
-        "template": '''// Hardware Detection - Identify board and peripherals at runtime
+    ),
+    "hardware-detection": Pattern(
+        name="Hardware Detection",
+        description="Auto-detect board type and connected sensors",
+        template='''// Hardware Detection - Identify board and peripherals at runtime
 
 #include <Wire.h>
 
+// === Non-blocking Timer ===
+''' + _EVERY_MS_CLASS + '''
 struct BoardInfo {{
   const char* name;
   uint32_t sramSize;
@@ -799,11 +920,11 @@ void loop() {{
   }}
 }}
 ''',
-    },
-    "data-logging": {
-        "name": "Data Logging (EEPROM/SD)",
-        "description": "Persistent storage with EEPROM and SD card",
-        "template": '''// Data Logging - EEPROM settings + SD card logging
+    ),
+    "data-logging": Pattern(
+        name="Data Logging (EEPROM/SD)",
+        description="Persistent storage with EEPROM and SD card",
+        template='''// Data Logging - EEPROM settings + SD card logging
 
 #include <EEPROM.h>
 #if defined(ESP32)
@@ -812,18 +933,7 @@ void loop() {{
   #include <SD.h>
 #endif
 
-// === CRC8 for data validation ===
-uint8_t crc8(const uint8_t* data, size_t len) {{
-  uint8_t crc = 0xFF;
-  while (len--) {{
-    crc ^= *data++;
-    for (uint8_t i = 0; i < 8; i++) {{
-      crc = (crc & 0x80) ? (crc << 1) ^ 0x31 : crc << 1;
-    }}
-  }}
-  return crc;
-}}
-
+{crc8_impl}
 // === EEPROM Settings Manager ===
 struct Settings {{
   uint8_t version;
@@ -943,6 +1053,8 @@ public:
   }}
 }};
 
+// === Non-blocking Timer ===
+''' + _EVERY_MS_CLASS + '''
 // === Usage Example ===
 SettingsManager settings;
 SDLogger sdLog("datalog.csv");
@@ -981,14 +1093,88 @@ void loop() {{
   }}
 }}
 ''',
-    },
+    ),
 }
 
+# =============================================================================
+# Template Compilation
+# =============================================================================
+
+_FORMATTER = string.Formatter()
+
+
+def _compile_template(template: str) -> tuple:
+    """Parse a format template once into (literal, field) pairs.
+
+    ``{{``/``}}`` escapes are resolved here and only bare ``{name}`` fields are
+    allowed, so rendering is a single join over dict lookups.
+    """
+    pieces = []
+    for literal, field, spec, conversion in _FORMATTER.parse(template):
+        if spec or conversion:
+            raise ValueError(f"Unsupported format spec in template field '{field}'")
+        pieces.append((literal, field))
+    return tuple(pieces)
+
+
+def _render(compiled: tuple, params: Mapping) -> str:
+    """Render a compiled template without re-parsing the format string."""
+    return "".join(
+        literal if field is None else literal + str(params[field])
+        for literal, field in compiled
+    )
+
+
+@lru_cache(maxsize=None)
+def _get_compiled(pattern: str) -> tuple:
+    """Compile a pattern's template on first use (--list never touches templates)."""
+    return _compile_template(PATTERNS[pattern].template)
+
 # =============================================================================
 # Code Generation Functions
 # =============================================================================
 
 
+_PIN_OVERRIDES = ("led_pin", "button_pin", "sda", "scl")
+
+
+@lru_cache(maxsize=None)
+def _board_params(board: str) -> Mapping:
+    """Default template parameters for a board, built once per process."""
+    config = BOARD_CONFIGS[board]
+    return MappingProxyType({
+        "baud": config.baud,
+        "led_pin": config.led,
+        "button_pin": config.button,
+        "sda": config.sda,
+        "scl": config.scl,
+        "board_name": config.name,
+        "i2c_lookup": _i2c_lookup_source(config.uses_progmem),
+        "crc8_impl": _crc8_source(False, config.uses_progmem),
+    })
+
+
+def _build_params(board: str, overrides: dict) -> Mapping:
+    """Merge user overrides onto the board defaults (no copy when there are none)."""
+    defaults = _board_params(board)
+    if not overrides:
+        return defaults
+
+    params = dict(defaults)
+    for key in _PIN_OVERRIDES:
+        if key in overrides:
+            params[key] = overrides[key]
+    if overrides.get("fast_crc"):
+        params["crc8_impl"] = _crc8_source(True, BOARD_CONFIGS[board].uses_progmem)
+    return params
+
+
+@lru_cache(maxsize=None)
+def _render_default(pattern: str, board: str) -> str:
+    """Render a (pattern, board) pair with no overrides, memoized per process."""
+    return _render(_get_compiled(pattern), _board_params(board))
+
+
 def generate_snippet(pattern: str, board: str, **kwargs) -> str:
     """Generate code snippet for specified pattern and board."""
     if pattern not in PATTERNS:
@@ -997,35 +1183,61 @@ def generate_snippet(pattern: str, board: str, **kwargs) -> str:
     if board not in BOARD_CONFIGS:
         return f"Error: Unknown board '{board}'. Supported: uno, esp32, rp2040"
 
-    template = PATTERNS[pattern]["template"]
-    config = BOARD_CONFIGS[board]
-
-    # Merge board config with user overrides
-    params = {
-        "baud": config["baud"],
-        "led_pin": kwargs.get("led_pin", config["led"]),
-        "button_pin": kwargs.get("button_pin", config["button"]),
-        "sda": kwargs.get("sda", config["sda"]),
-        "scl": kwargs.get("scl", config["scl"]),
-        "board_name": config["name"],
-    }
-
     try:
-        return template.format(**params)
+        if not kwargs:
+            return _render_default(pattern, board)
+        return _render(_get_compiled(pattern), _build_params(board, kwargs))
     except KeyError as e:
         return f"Error: Missing parameter {e}"
 
 
-def list_patterns():
-    """List all available patterns."""
-    print("\n=== Available Patterns ===\n")
+@lru_cache(maxsize=None)
+def _list_text() -> str:
+    """Build the --list output once; PATTERNS and BOARD_CONFIGS are static."""
+    lines = ["", "=== Available Patterns ===", ""]
     for key, info in PATTERNS.items():
-        print(f"  {key:20} - {info['description']}")
-    print("\n=== Supported Boards ===\n")
+        lines.append(f"  {key:20} - {info.description}")
+    lines += ["", "=== Supported Boards ===", ""]
     for key, info in BOARD_CONFIGS.items():
-        wifi = "WiFi" if info["has_wifi"] else ""
-        print(f"  {key:10} - {info['name']:15} ({info['sram']} bytes SRAM) {wifi}")
-    print()
+        wifi = "WiFi" if info.has_wifi else ""
+        lines.append(f"  {key:10} - {info.name:15} ({info.sram} bytes SRAM) {wifi}")
+    lines += ["", ""]
+    return "\n".join(lines)
+
+
+def _write_stdout(code: str):
+    """Write generated code (plus trailing newline) to stdout in one write."""
+    text = code + "\n"
+    try:
+        buffer = sys.stdout.buffer
+    except AttributeError:  # stdout replaced by a text-only stream
+        sys.stdout.write(text)
+        return
+    sys.stdout.flush()  # keep ordering with earlier print() output
+    buffer.write(text.encode(sys.stdout.encoding or "utf-8", sys.stdout.errors or "strict"))
+    buffer.flush()
+
+
+def _write_if_changed(filename: str, code: str) -> bool:
+    """Write code to filename unless it already holds identical content.
+
+    Leaving an up-to-date file untouched keeps its mtime, so build tools
+    watching the sketch do not rebuild after a no-op regeneration.
+    """
+    path = Path(filename)
+    data = code.encode("utf-8")
+    try:
+        if path.stat().st_size == len(data) and path.read_bytes() == data:
+            return False
+    except OSError:
+        pass
+    path.write_bytes(data)
+    return True
+
+
+def list_patterns():
+    """List all available patterns."""
+    sys.stdout.write(_list_text())
 
 
 def interactive_mode():
@@ -1036,53 +1248,42 @@ def interactive_mode():
     print("Available patterns:")
     patterns_list = list(PATTERNS.keys())
     for i, p in enumerate(patterns_list, 1):
-        print(f"  {i}. {p} - {PATTERNS[p]['description']}")
-
-    while True:
-        try:
-            choice = input("\nSelect pattern (1-9): ").strip()
-            idx = int(choice) - 1
-            if 0 <= idx < len(patterns_list):
-                pattern = patterns_list[idx]
-                break
-        except ValueError:
-            pass
+        print(f"  {i}. {p} - {PATTERNS[p].description}")
+
+    pattern_choices = {str(i): p for i, p in enumerate(patterns_list, 1)}
+    prompt = f"\nSelect pattern (1-{len(patterns_list)}): "
+    while (pattern := pattern_choices.get(input(prompt).strip())) is None:
         print("Invalid choice, try again.")
 
     # Select board
     print("\nAvailable boards:")
     boards_list = list(BOARD_CONFIGS.keys())
     for i, b in enumerate(boards_list, 1):
-        wifi = " (WiFi)" if BOARD_CONFIGS[b]["has_wifi"] else ""
-        print(f"  {i}. {b} - {BOARD_CONFIGS[b]['name']}{wifi}")
-
-    while True:
-        try:
-            choice = input("\nSelect board (1-3): ").strip()
-            idx = int(choice) - 1
-            if 0 <= idx < len(boards_list):
-                board = boards_list[idx]
-                break
-        except ValueError:
-            pass
+        wifi = " (WiFi)" if BOARD_CONFIGS[b].has_wifi else ""
+        print(f"  {i}. {b} - {BOARD_CONFIGS[b].name}{wifi}")
+
+    board_choices = {str(i): b for i, b in enumerate(boards_list, 1)}
+    prompt = f"\nSelect board (1-{len(boards_list)}): "
+    while (board := board_choices.get(input(prompt).strip())) is None:
         print("Invalid choice, try again.")
 
     # Generate
     print(f"\n{'='*60}")
-    print(f"Generating: {PATTERNS[pattern]['name']} for {BOARD_CONFIGS[board]['name']}")
+    print(f"Generating: {PATTERNS[pattern].name} for {BOARD_CONFIGS[board].name}")
     print(f"{'='*60}\n")
 
     code = generate_snippet(pattern, board)
-    print(code)
+    _write_stdout(code)
 
     # Save option
     save = input("\nSave to file? (y/n): ").strip().lower()
     if save == "y":
         filename = input("Filename (e.g., sketch.ino): ").strip()
         if filename:
-            with open(filename, "w") as f:
-                f.write(code)
-            print(f"✓ Saved to {filename}")
+            if _write_if_changed(filename, code):
+                print(f"✓ Saved to {filename}")
+            else:
+                print(f"✓ {filename} is already up to date")
 
 
 # =============================================================================
@@ -1091,6 +1292,11 @@ def interactive_mode():
 
 
 def main():
+    # Discovery fast path: no need to build the full parser for a bare --list
+    if sys.argv[1:] in (["--list"], ["-l"]):
+        list_patterns()
+        return
+
     parser = argparse.ArgumentParser(
         description="Generate Arduino code snippets from pattern templates",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -1116,6 +1322,11 @@ Examples:
     )
     parser.add_argument("--button-pin", type=int, help="Override button pin")
     parser.add_argument("--led-pin", type=int, help="Override LED pin")
+    parser.add_argument(
+        "--fast-crc",
+        action="store_true",
+        help="Use a 256-entry lookup table for CRC8 (data-logging pattern)",
+    )
 
     args = parser.parse_args()
 
@@ -1138,15 +1349,18 @@ Examples:
         kwargs["button_pin"] = args.button_pin
     if args.led_pin:
         kwargs["led_pin"] = args.led_pin
+    if args.fast_crc:
+        kwargs["fast_crc"] = True
 
     code = generate_snippet(args.pattern, args.board, **kwargs)
 
     if args.output:
-        with open(args.output, "w") as f:
-            f.write(code)
-        print(f"✓ Generated {args.output}")
+        if _write_if_changed(args.output, code):
+            print(f"✓ Generated {args.output}")
+        else:
+            print(f"✓ {args.output} is already up to date")
     else:
-        print(code)
+        _write_stdout(code)
 
 
 if __name__ == "__main__":
@@ -19,94 +19,119 @@ Usage:
 import argparse
 import os
 import sys
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional
+from types import MappingProxyType
+from typing import Optional, Sequence, Tuple
 
 # =============================================================================
 # Project Templates
 # =============================================================================
 
-PROJECT_TYPES = {
-    "environmental": {
-        "name": "Environmental Monitor",
-        "description": "Multi-sensor data logger (temperature, humidity, light)",
-        "sensors": ["DHT22", "Photoresistor"],
-        "features": ["CSV logging", "SD card (optional)", "Button control", "LED status"],
-        "patterns": ["config", "filtering", "scheduler", "csv", "data-logging"],
-        "libraries": ["DHT sensor library"],
-    },
-    "robot": {
-        "name": "Robot Controller",
-        "description": "Motor control with obstacle avoidance and state machine",
-        "sensors": ["Ultrasonic HC-SR04", "Line sensor (optional)"],
-        "actuators": ["DC motors (L298N)", "Servo"],
-        "features": ["State machine", "Button control", "Obstacle avoidance"],
-        "patterns": ["config", "buttons", "state-machine", "scheduler"],
-        "libraries": ["Servo"],
-    },
-    "iot": {
-        "name": "IoT Data Logger",
-        "description": "WiFi-connected sensor with MQTT/HTTP data transmission",
-        "sensors": ["BME280", "DHT22 (alternative)"],
-        "features": ["WiFi connectivity", "MQTT publishing", "JSON formatting", "Deep sleep"],
-        "patterns": ["config", "hardware-detection", "scheduler", "filtering"],
-        "libraries": ["WiFi", "PubSubClient", "ArduinoJson"],
-        "board_requirement": "esp32",
-    },
-}
-
-BOARD_CONFIGS = {
-    "uno": {
-        "name": "Arduino UNO",
-        "platform": "atmelavr",
-        "board": "uno",
-        "framework": "arduino",
-        "f_cpu": "16000000L",
-        "baud": 9600,
-        "sram": 2048,
-        "defines": ["ARDUINO_AVR_UNO"],
-    },
-    "esp32": {
-        "name": "ESP32 DevKit",
-        "platform": "espressif32",
-        "board": "esp32dev",
-        "framework": "arduino",
-        "f_cpu": "240000000L",
-        "baud": 115200,
-        "sram": 520000,
-        "defines": ["ESP32"],
-    },
-    "rp2040": {
-        "name": "Raspberry Pi Pico",
-        "platform": "raspberrypi",
-        "board": "pico",
-        "framework": "arduino",
-        "f_cpu": "133000000L",
-        "baud": 115200,
-        "sram": 264000,
-        "defines": ["ARDUINO_ARCH_RP2040"],
-    },
-}
+@dataclass(frozen=True, slots=True)
+class ProjectType:
+    """Project template metadata"""
+    name: str
+    description: str
+    sensors: Tuple[str, ...]
+    features: Tuple[str, ...]
+    patterns: Tuple[str, ...]
+    libraries: Tuple[str, ...]
+    actuators: Tuple[str, ...] = ()
+    board_requirement: Optional[str] = None
+    # README bullet lists, rendered once when the record is created
+    sensors_md: str = field(init=False, repr=False)
+    features_md: str = field(init=False, repr=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, "sensors_md", "\n".join(f"- {s}" for s in self.sensors))
+        object.__setattr__(self, "features_md", "\n".join(f"- {f}" for f in self.features))
+
+
+PROJECT_TYPES = MappingProxyType({
+    "environmental": ProjectType(
+        name="Environmental Monitor",
+        description="Multi-sensor data logger (temperature, humidity, light)",
+        sensors=("DHT22", "Photoresistor"),
+        features=("CSV logging", "SD card (optional)", "Button control", "LED status"),
+        patterns=("config", "filtering", "scheduler", "csv", "data-logging"),
+        libraries=("DHT sensor library",),
+    ),
+    "robot": ProjectType(
+        name="Robot Controller",
+        description="Motor control with obstacle avoidance and state machine",
+        sensors=("Ultrasonic HC-SR04", "Line sensor (optional)"),
+        actuators=("DC motors (L298N)", "Servo"),
+        features=("State machine", "Button control", "Obstacle avoidance"),
+        patterns=("config", "buttons", "state-machine", "scheduler"),
+        libraries=("Servo",),
+    ),
+    "iot": ProjectType(
+        name="IoT Data Logger",
+        description="WiFi-connected sensor with MQTT/HTTP data transmission",
+        sensors=("BME280", "DHT22 (alternative)"),
+        features=("WiFi connectivity", "MQTT publishing", "JSON formatting", "Deep sleep"),
+        patterns=("config", "hardware-detection", "scheduler", "filtering"),
+        libraries=("WiFi", "PubSubClient", "ArduinoJson"),
+        board_requirement="esp32",
+    ),
+})
+
+@dataclass(frozen=True, slots=True)
+class BoardConfig:
+    """Target board build settings"""
+    name: str
+    platform: str
+    board: str
+    framework: str
+    f_cpu_hz: int
+    baud: int
+    sram: int
+    defines: Tuple[str, ...]
+
+
+BOARD_CONFIGS = MappingProxyType({
+    "uno": BoardConfig(
+        name="Arduino UNO",
+        platform="atmelavr",
+        board="uno",
+        framework="arduino",
+        f_cpu_hz=16_000_000,
+        baud=9600,
+        sram=2048,
+        defines=("ARDUINO_AVR_UNO",),
+    ),
+    "esp32": BoardConfig(
+        name="ESP32 DevKit",
+        platform="espressif32",
+        board="esp32dev",
+        framework="arduino",
+        f_cpu_hz=240_000_000,
+        baud=115200,
+        sram=520000,
+        defines=("ESP32",),
+    ),
+    "rp2040": BoardConfig(
+        name="Raspberry Pi Pico",
+        platform="raspberrypi",
+        board="pico",
+        framework="arduino",
+        f_cpu_hz=133_000_000,
+        baud=115200,
+        sram=264000,
+        defines=("ARDUINO_ARCH_RP2040",),
+    ),
+})
 
 # =============================================================================
 # Template Generators
 # =============================================================================
 
 
-def generate_config_h(project_type: str, board: str, project_name: str) -> str:
-    """Generate config.h with board-specific settings."""
-    proj = PROJECT_TYPES[project_type]
-    
-    config = f'''// config.h - Hardware configuration for {project_name}
-// Project: {proj["name"]}
-// Generated: {datetime.now().strftime("%Y-%m-%d")}
-
-#ifndef CONFIG_H
-#define CONFIG_H
-
-// === Board Detection ===
+# Static config.h sections, built once at import. Only the header depends on
+# the project name, so generate_config_h() just joins these pieces.
+_CONFIG_BOARD_DETECTION = '''// === Board Detection ===
 #if defined(ARDUINO_AVR_UNO) || defined(ARDUINO_AVR_NANO)
   #define BOARD_NAME "Arduino UNO"
   #define LED_PIN 13
@@ -143,9 +168,8 @@ def generate_config_h(project_type: str, board: str, project_name: str) -> str:
 
 '''
 
-    # Project-specific pins
-    if project_type == "environmental":
-        config += '''// === Environmental Monitor Pins ===
+_CONFIG_PROJECT_PINS = {
+    "environmental": '''// === Environmental Monitor Pins ===
 #define DHT_PIN 2
 #define LIGHT_PIN A0
 #define SD_CS_PIN 10
@@ -156,9 +180,8 @@ def generate_config_h(project_type: str, board: str, project_name: str) -> str:
 #define LOG_INTERVAL 60000
 #define HEARTBEAT_INTERVAL 2000
 
-'''
-    elif project_type == "robot":
-        config += '''// === Robot Controller Pins ===
+''',
+    "robot": '''// === Robot Controller Pins ===
 #define MOTOR_L_EN 5
 #define MOTOR_L_IN1 6
 #define MOTOR_L_IN2 7
@@ -175,9 +198,8 @@ def generate_config_h(project_type: str, board: str, project_name: str) -> str:
 #define MOTOR_SPEED_DEFAULT 200
 #define TURN_DURATION_MS 500
 
-'''
-    elif project_type == "iot":
-        config += '''// === IoT Device Configuration ===
+''',
+    "iot": '''// === IoT Device Configuration ===
 #define DHT_PIN 4
 #define STATUS_LED 2
 
@@ -195,83 +217,162 @@ def generate_config_h(project_type: str, board: str, project_name: str) -> str:
 #define PUBLISH_INTERVAL 60000   // Publish every 60s
 #define WIFI_TIMEOUT 30000       // WiFi connection timeout
 
-'''
+''',
+}
 
-    config += '''// === Common Settings ===
+_CONFIG_COMMON = '''// === Common Settings ===
 #define DEBOUNCE_MS 50
 #define FILTER_SIZE 10
 
 #endif // CONFIG_H
 '''
-    return config
 
 
-def generate_main_ino(project_type: str, board: str, project_name: str) -> str:
-    """Generate main.ino for the project type."""
-    proj = PROJECT_TYPES[project_type]
-    
-    if project_type == "environmental":
-        return f'''// {project_name} - Environmental Monitor
-// {proj["description"]}
-// Generated: {datetime.now().strftime("%Y-%m-%d")}
+def _c_string(text: str) -> str:
+    """Escape text for use inside a C string literal."""
+    return text.replace("\\", "\\\\").replace('"', '\\"')
 
-#include "config.h"
-#include <DHT.h>
 
-// === Timer Class ===
-class EveryMs {{
+def generate_config_h(project_type: str, proj: ProjectType, project_name: str, today: str) -> str:
+    """Generate config.h with board-specific settings."""
+    header = (
+        f"// config.h - Hardware configuration for {project_name}\n"
+        f"// Project: {proj.name}\n"
+        f"// Generated: {today}\n\n"
+        "#ifndef CONFIG_H\n"
+        "#define CONFIG_H\n\n"
+        f'#define PROJECT_NAME "{_c_string(project_name)}"\n\n'
+    )
+    return "".join((
+        header,
+        _CONFIG_BOARD_DETECTION,
+        _CONFIG_PROJECT_PINS.get(project_type, ""),
+        _CONFIG_COMMON,
+    ))
+
+
+# Helper classes shared by every main.ino, written once to src/timing.h.
+_TIMING_EVERY_MS = '''// === Timer Class ===
+class EveryMs {
 private:
   unsigned long interval;
   unsigned long lastTrigger;
 public:
-  EveryMs(unsigned long ms) : interval(ms), lastTrigger(0) {{}}
-  bool check() {{
+  EveryMs(unsigned long ms) : interval(ms), lastTrigger(0) {}
+  bool check() {
     unsigned long now = millis();
-    if (now - lastTrigger >= interval) {{
+    if (now - lastTrigger >= interval) {
       lastTrigger = now;
       return true;
-    }}
+    }
     return false;
-  }}
-}};
+  }
+  void reset() { lastTrigger = millis(); }
+};
+
+'''
 
-// === Moving Average Filter ===
-class MovingAverageFilter {{
+_TIMING_MOVING_AVERAGE = '''// === Moving Average Filter ===
+class MovingAverageFilter {
 private:
   static const uint8_t SIZE = FILTER_SIZE;
-  int values[SIZE];
+  int values[SIZE] = {0};
   uint8_t index = 0;
   uint8_t count = 0;
+  long sum = 0;  // running sum of values[], updated in O(1)
 public:
-  int filter(int newValue) {{
+  int filter(int newValue) {
+    sum += (long)newValue - values[index];
     values[index] = newValue;
-    index = (index + 1) % SIZE;
+    // SIZE is a constant, so only one branch is compiled in; a power of
+    // two wraps with a mask, any other size with compare-and-reset
+    if ((SIZE & (SIZE - 1)) == 0) {
+      index = (index + 1) & (SIZE - 1);
+    } else if (++index == SIZE) {
+      index = 0;
+    }
     if (count < SIZE) count++;
-    long sum = 0;
-    for (uint8_t i = 0; i < count; i++) sum += values[i];
     return sum / count;
-  }}
-}};
+  }
+};
 
-// === Debounced Button ===
-class DebouncedButton {{
+'''
+
+_TIMING_DEBOUNCED_BUTTON = '''// === Debounced Button ===
+class DebouncedButton {
 private:
   uint8_t pin;
   bool lastState = HIGH;
   unsigned long lastDebounce = 0;
 public:
-  DebouncedButton(uint8_t p) : pin(p) {{}}
-  void begin() {{ pinMode(pin, INPUT_PULLUP); }}
-  bool pressed() {{
+  DebouncedButton(uint8_t p) : pin(p) {}
+  void begin() { pinMode(pin, INPUT_PULLUP); }
+  bool pressed() {
     bool state = digitalRead(pin);
-    if (state != lastState && (millis() - lastDebounce) > DEBOUNCE_MS) {{
+    if (state != lastState && (millis() - lastDebounce) > DEBOUNCE_MS) {
       lastDebounce = millis();
       lastState = state;
       return state == LOW;
-    }}
+    }
     return false;
-  }}
-}};
+  }
+};
+
+'''
+
+
+def generate_timing_h(project_type: str, today: str) -> str:
+    """Generate timing.h with the timer, button and filter helpers."""
+    parts = [
+        "// timing.h - Non-blocking timer and input helpers\n"
+        f"// Generated: {today}\n\n"
+        "#ifndef TIMING_H\n"
+        "#define TIMING_H\n\n"
+        "#include <Arduino.h>\n"
+        '#include "config.h"\n\n',
+        _TIMING_EVERY_MS,
+    ]
+    if project_type == "environmental":
+        parts.append(_TIMING_MOVING_AVERAGE)
+    parts.append(_TIMING_DEBOUNCED_BUTTON)
+    parts.append("#endif // TIMING_H\n")
+    return "".join(parts)
+
+
+# main.ino bodies below the header comment. They do not depend on the board
+# or project name (the banner uses PROJECT_NAME from config.h).
+_ENVIRONMENTAL_MAIN_BODY = '''
+#include "config.h"
+#include "timing.h"
+#include <DHT.h>
+
+// === Light Sensor ADC ===
+#if defined(ARDUINO_AVR_UNO)
+// Free-running ADC: conversions run in the background and the ISR keeps the
+// latest sample, so reading the light level never waits ~110us for analogRead().
+volatile uint16_t latestLight = 0;
+
+ISR(ADC_vect) {
+  latestLight = ADC;
+}
+
+void beginLightAdc() {
+  ADMUX = _BV(REFS0) | ((LIGHT_PIN - A0) & 0x07);  // AVcc reference, light channel
+  ADCSRB = 0;                                       // Free-running trigger source
+  ADCSRA = _BV(ADEN) | _BV(ADATE) | _BV(ADIE)       // Enable, auto-trigger, interrupt,
+         | _BV(ADSC) | 0x07;                        // start, /128 prescaler
+}
+
+int readLight() {
+  noInterrupts();
+  uint16_t value = latestLight;
+  interrupts();
+  return value;
+}
+#else
+void beginLightAdc() {}
+int readLight() { return analogRead(LIGHT_PIN); }
+#endif
 
 // === Global Objects ===
 DHT dht(DHT_PIN, DHT22);
@@ -283,56 +384,62 @@ EveryMs lightTimer(LIGHT_INTERVAL);
 EveryMs logTimer(LOG_INTERVAL);
 EveryMs heartbeatTimer(HEARTBEAT_INTERVAL);
 
-struct SensorData {{
+struct SensorData {
   float temperature = NAN;
   float humidity = NAN;
   int lightLevel = 0;
-}} data;
+} data;
+
+// Keep the previous value when a sensor read fails (NaN)
+static inline float updateIfValid(float prev, float sample) {
+  return isnan(sample) ? prev : sample;
+}
 
 bool loggingEnabled = true;
 bool ledState = false;
 
-void setup() {{
+void setup() {
   Serial.begin(SERIAL_BAUD);
   pinMode(LED_PIN, OUTPUT);
   button.begin();
   dht.begin();
+  beginLightAdc();
   
-  Serial.println(F("=== {project_name} ==="));
+  Serial.println(F("=== " PROJECT_NAME " ==="));
   Serial.print(F("Board: "));
   Serial.println(F(BOARD_NAME));
   Serial.println(F("time_ms,temp_c,humidity_%,light"));
-}}
+}
 
-void loop() {{
+void loop() {
   // Heartbeat LED
-  if (heartbeatTimer.check()) {{
+  if (heartbeatTimer.check()) {
     ledState = !ledState;
     digitalWrite(LED_PIN, ledState);
-  }}
+  }
   
   // Toggle logging with button
-  if (button.pressed()) {{
+  if (button.pressed()) {
     loggingEnabled = !loggingEnabled;
     Serial.print(F("Logging: "));
     Serial.println(loggingEnabled ? F("ON") : F("OFF"));
-  }}
+  }
   
   // Read DHT22
-  if (dhtTimer.check()) {{
+  if (dhtTimer.check()) {
     float t = dht.readTemperature();
     float h = dht.readHumidity();
-    if (!isnan(t)) data.temperature = t;
-    if (!isnan(h)) data.humidity = h;
-  }}
+    data.temperature = updateIfValid(data.temperature, t);
+    data.humidity = updateIfValid(data.humidity, h);
+  }
   
   // Read light sensor
-  if (lightTimer.check()) {{
-    data.lightLevel = lightFilter.filter(analogRead(LIGHT_PIN));
-  }}
+  if (lightTimer.check()) {
+    data.lightLevel = lightFilter.filter(readLight());
+  }
   
   // Log data
-  if (loggingEnabled && logTimer.check()) {{
+  if (loggingEnabled && logTimer.check()) {
     Serial.print(millis());
     Serial.print(',');
     Serial.print(data.temperature, 1);
@@ -340,67 +447,35 @@ void loop() {{
     Serial.print(data.humidity, 1);
     Serial.print(',');
     Serial.println(data.lightLevel);
-  }}
-}}
+  }
+}
 '''
 
-    elif project_type == "robot":
-        return f'''// {project_name} - Robot Controller
-// {proj["description"]}
-// Generated: {datetime.now().strftime("%Y-%m-%d")}
-
+_ROBOT_MAIN_BODY = '''
 #include "config.h"
+#include "timing.h"
 #include <Servo.h>
 
 // === State Machine ===
-enum class RobotState {{
+enum class RobotState {
   IDLE,
   FORWARD,
   TURNING_LEFT,
   TURNING_RIGHT,
   REVERSE,
   SCANNING
-}};
-
-const char* stateNames[] = {{"IDLE", "FORWARD", "LEFT", "RIGHT", "REVERSE", "SCAN"}};
-
-// === Timer Class ===
-class EveryMs {{
-private:
-  unsigned long interval;
-  unsigned long lastTrigger;
-public:
-  EveryMs(unsigned long ms) : interval(ms), lastTrigger(0) {{}}
-  bool check() {{
-    unsigned long now = millis();
-    if (now - lastTrigger >= interval) {{
-      lastTrigger = now;
-      return true;
-    }}
-    return false;
-  }}
-  void reset() {{ lastTrigger = millis(); }}
-}};
-
-// === Debounced Button ===
-class DebouncedButton {{
-private:
-  uint8_t pin;
-  bool lastState = HIGH;
-  unsigned long lastDebounce = 0;
-public:
-  DebouncedButton(uint8_t p) : pin(p) {{}}
-  void begin() {{ pinMode(pin, INPUT_PULLUP); }}
-  bool pressed() {{
-    bool state = digitalRead(pin);
-    if (state != lastState && (millis() - lastDebounce) > DEBOUNCE_MS) {{
-      lastDebounce = millis();
-      lastState = state;
-      return state == LOW;
-    }}
-    return false;
-  }}
-}};
+};
+
+// State names live in flash (PROGMEM) to save SRAM on AVR
+const char stateIdle[] PROGMEM = "IDLE";
+const char stateForward[] PROGMEM = "FORWARD";
+const char stateLeft[] PROGMEM = "LEFT";
+const char stateRight[] PROGMEM = "RIGHT";
+const char stateReverse[] PROGMEM = "REVERSE";
+const char stateScan[] PROGMEM = "SCAN";
+const char* const stateNames[] PROGMEM = {
+  stateIdle, stateForward, stateLeft, stateRight, stateReverse, stateScan
+};
 
 // === Global Objects ===
 Servo servo;
@@ -413,114 +488,147 @@ EveryMs sensorTimer(50);   // Check sensors every 50ms
 EveryMs statusTimer(1000); // Print status every 1s
 
 // === Motor Control ===
-void setMotors(int leftSpeed, int rightSpeed) {{
+void setMotors(int leftSpeed, int rightSpeed) {
   // Left motor
-  if (leftSpeed >= 0) {{
+  if (leftSpeed >= 0) {
     digitalWrite(MOTOR_L_IN1, HIGH);
     digitalWrite(MOTOR_L_IN2, LOW);
-  }} else {{
+  } else {
     digitalWrite(MOTOR_L_IN1, LOW);
     digitalWrite(MOTOR_L_IN2, HIGH);
     leftSpeed = -leftSpeed;
-  }}
+  }
   analogWrite(MOTOR_L_EN, constrain(leftSpeed, 0, 255));
   
   // Right motor
-  if (rightSpeed >= 0) {{
+  if (rightSpeed >= 0) {
     digitalWrite(MOTOR_R_IN1, HIGH);
     digitalWrite(MOTOR_R_IN2, LOW);
-  }} else {{
+  } else {
     digitalWrite(MOTOR_R_IN1, LOW);
     digitalWrite(MOTOR_R_IN2, HIGH);
     rightSpeed = -rightSpeed;
-  }}
+  }
   analogWrite(MOTOR_R_EN, constrain(rightSpeed, 0, 255));
-}}
+}
 
-void stopMotors() {{
+void stopMotors() {
   setMotors(0, 0);
-}}
+}
 
 // === Ultrasonic Sensor ===
-long readDistanceCm() {{
+// The echo pulse is timed by a pin-change interrupt instead of pulseIn(), so
+// the loop never busy-waits for it. startPing() fires the trigger and the
+// distance is picked up on a later call once the echo has come back.
+volatile unsigned long echoStart = 0;
+volatile unsigned long echoDuration = 0;
+
+void onEcho() {
+  if (digitalRead(ULTRASONIC_ECHO)) {
+    echoStart = micros();
+  } else {
+    echoDuration = micros() - echoStart;
+  }
+}
+
+void startPing() {
+  noInterrupts();
+  echoDuration = 0;  // Stays 0 (no reading) if the echo never returns
+  interrupts();
   digitalWrite(ULTRASONIC_TRIG, LOW);
   delayMicroseconds(2);
   digitalWrite(ULTRASONIC_TRIG, HIGH);
   delayMicroseconds(10);
   digitalWrite(ULTRASONIC_TRIG, LOW);
-  
-  long duration = pulseIn(ULTRASONIC_ECHO, HIGH, 30000);
-  return duration * 0.034 / 2;  // Convert to cm
-}}
+}
+
+long getLastDistanceCm() {
+  noInterrupts();
+  unsigned long duration = echoDuration;
+  interrupts();
+  return duration / 58;  // ~58us round trip per cm
+}
 
 // === State Machine ===
-void transitionTo(RobotState newState) {{
-  if (newState != currentState) {{
+void transitionTo(RobotState newState) {
+  if (newState != currentState) {
     currentState = newState;
     stateStartTime = millis();
     Serial.print(F("State: "));
-    Serial.println(stateNames[static_cast<int>(currentState)]);
-  }}
-}}
+    Serial.println((const __FlashStringHelper*)pgm_read_ptr(&stateNames[static_cast<int>(currentState)]));
+  }
+}
+
+// One handler per RobotState, indexed by the enum value (keep the same order)
+void doIdle(unsigned long elapsed, long distance) {
+  stopMotors();
+}
+
+void doForward(unsigned long elapsed, long distance) {
+  setMotors(MOTOR_SPEED_DEFAULT, MOTOR_SPEED_DEFAULT);
+  if (distance > 0 && distance < OBSTACLE_DISTANCE_CM) {
+    transitionTo(RobotState::REVERSE);
+  }
+}
+
+void doTurnLeft(unsigned long elapsed, long distance) {
+  setMotors(-MOTOR_SPEED_DEFAULT, MOTOR_SPEED_DEFAULT);
+  if (elapsed > TURN_DURATION_MS) {
+    transitionTo(RobotState::FORWARD);
+  }
+}
 
-void updateStateMachine() {{
-  long distance = readDistanceCm();
+void doTurnRight(unsigned long elapsed, long distance) {
+  setMotors(MOTOR_SPEED_DEFAULT, -MOTOR_SPEED_DEFAULT);
+  if (elapsed > TURN_DURATION_MS) {
+    transitionTo(RobotState::FORWARD);
+  }
+}
+
+void doReverse(unsigned long elapsed, long distance) {
+  setMotors(-MOTOR_SPEED_DEFAULT/2, -MOTOR_SPEED_DEFAULT/2);
+  if (elapsed > 500) {
+    transitionTo(RobotState::SCANNING);
+  }
+}
+
+void doScan(unsigned long elapsed, long distance) {
+  stopMotors();
+  // Scan left and right, pick clearest direction
+  servo.write(45);
+  delay(200);
+  startPing();
+  delay(60);
+  long leftDist = getLastDistanceCm();
+  servo.write(135);
+  delay(200);
+  startPing();
+  delay(60);
+  long rightDist = getLastDistanceCm();
+  servo.write(90);
+  
+  if (leftDist > rightDist) {
+    transitionTo(RobotState::TURNING_LEFT);
+  } else {
+    transitionTo(RobotState::TURNING_RIGHT);
+  }
+}
+
+typedef void (*StateFn)(unsigned long elapsed, long distance);
+const StateFn stateHandlers[] PROGMEM = {
+  doIdle, doForward, doTurnLeft, doTurnRight, doReverse, doScan
+};
+
+void updateStateMachine() {
+  long distance = getLastDistanceCm();
+  startPing();  // Result is read on the next tick
   unsigned long elapsed = millis() - stateStartTime;
   
-  switch (currentState) {{
-    case RobotState::IDLE:
-      stopMotors();
-      break;
-      
-    case RobotState::FORWARD:
-      setMotors(MOTOR_SPEED_DEFAULT, MOTOR_SPEED_DEFAULT);
-      if (distance > 0 && distance < OBSTACLE_DISTANCE_CM) {{
-        transitionTo(RobotState::REVERSE);
-      }}
-      break;
-      
-    case RobotState::REVERSE:
-      setMotors(-MOTOR_SPEED_DEFAULT/2, -MOTOR_SPEED_DEFAULT/2);
-      if (elapsed > 500) {{
-        transitionTo(RobotState::SCANNING);
-      }}
-      break;
-      
-    case RobotState::SCANNING:
-      stopMotors();
-      // Scan left and right, pick clearest direction
-      servo.write(45);
-      delay(200);
-      long leftDist = readDistanceCm();
-      servo.write(135);
-      delay(200);
-      long rightDist = readDistanceCm();
-      servo.write(90);
-      
-      if (leftDist > rightDist) {{
-        transitionTo(RobotState::TURNING_LEFT);
-      }} else {{
-        transitionTo(RobotState::TURNING_RIGHT);
-      }}
-      break;
-      
-    case RobotState::TURNING_LEFT:
-      setMotors(-MOTOR_SPEED_DEFAULT, MOTOR_SPEED_DEFAULT);
-      if (elapsed > TURN_DURATION_MS) {{
-        transitionTo(RobotState::FORWARD);
-      }}
-      break;
-      
-    case RobotState::TURNING_RIGHT:
-      setMotors(MOTOR_SPEED_DEFAULT, -MOTOR_SPEED_DEFAULT);
-      if (elapsed > TURN_DURATION_MS) {{
-        transitionTo(RobotState::FORWARD);
-      }}
-      break;
-  }}
-}}
-
-void setup() {{
+  StateFn handler = (StateFn)pgm_read_ptr(&stateHandlers[static_cast<int>(currentState)]);
+  handler(elapsed, distance);
+}
+
+void setup() {
   Serial.begin(SERIAL_BAUD);
   
   // Motor pins
@@ -534,6 +642,7 @@ void setup() {{
   // Ultrasonic pins
   pinMode(ULTRASONIC_TRIG, OUTPUT);
   pinMode(ULTRASONIC_ECHO, INPUT);
+  attachInterrupt(digitalPinToInterrupt(ULTRASONIC_ECHO), onEcho, CHANGE);
   
   // Servo
   servo.attach(SERVO_PIN);
@@ -543,67 +652,47 @@ void setup() {{
   startButton.begin();
   pinMode(LED_PIN, OUTPUT);
   
-  Serial.println(F("=== {project_name} ==="));
+  Serial.println(F("=== " PROJECT_NAME " ==="));
   Serial.println(F("Press button to start/stop"));
-}}
+}
 
-void loop() {{
+void loop() {
   // Start/stop with button
-  if (startButton.pressed()) {{
-    if (currentState == RobotState::IDLE) {{
+  if (startButton.pressed()) {
+    if (currentState == RobotState::IDLE) {
       transitionTo(RobotState::FORWARD);
-    }} else {{
+    } else {
       transitionTo(RobotState::IDLE);
-    }}
-  }}
+    }
+  }
   
   // Update state machine
-  if (sensorTimer.check()) {{
+  if (sensorTimer.check()) {
     updateStateMachine();
-  }}
+  }
   
   // Status LED
   digitalWrite(LED_PIN, currentState != RobotState::IDLE);
   
   // Print status
-  if (statusTimer.check()) {{
+  if (statusTimer.check()) {
     Serial.print(F("Distance: "));
-    Serial.print(readDistanceCm());
+    Serial.print(getLastDistanceCm());
     Serial.println(F(" cm"));
-  }}
-}}
+  }
+}
 '''
 
-    elif project_type == "iot":
-        return f'''// {project_name} - IoT Data Logger
-// {proj["description"]}
-// Generated: {datetime.now().strftime("%Y-%m-%d")}
-// Requires: ESP32
+_IOT_MAIN_BODY = '''// Requires: ESP32
 
 #include "config.h"
+#include "timing.h"
 
 #ifdef HAS_WIFI
 #include <WiFi.h>
 #include <PubSubClient.h>
 #include <DHT.h>
 
-// === Timer Class ===
-class EveryMs {{
-private:
-  unsigned long interval;
-  unsigned long lastTrigger;
-public:
-  EveryMs(unsigned long ms) : interval(ms), lastTrigger(0) {{}}
-  bool check() {{
-    unsigned long now = millis();
-    if (now - lastTrigger >= interval) {{
-      lastTrigger = now;
-      return true;
-    }}
-    return false;
-  }}
-}};
-
 // === Global Objects ===
 WiFiClient wifiClient;
 PubSubClient mqtt(wifiClient);
@@ -612,37 +701,43 @@ DHT dht(DHT_PIN, DHT22);
 EveryMs sensorTimer(SENSOR_INTERVAL);
 EveryMs publishTimer(PUBLISH_INTERVAL);
 EveryMs statusTimer(5000);
+EveryMs ledTimer(100);
 
-struct SensorData {{
+struct SensorData {
   float temperature = NAN;
   float humidity = NAN;
-}} data;
+} data;
+
+// Keep the previous value when a sensor read fails (NaN)
+static inline float updateIfValid(float prev, float sample) {
+  return isnan(sample) ? prev : sample;
+}
 
 // === WiFi Management ===
-bool connectWiFi() {{
+bool connectWiFi() {
   if (WiFi.status() == WL_CONNECTED) return true;
   
   Serial.print(F("Connecting to WiFi"));
   WiFi.begin(WIFI_SSID, WIFI_PASSWORD);
   
   unsigned long start = millis();
-  while (WiFi.status() != WL_CONNECTED) {{
-    if (millis() - start > WIFI_TIMEOUT) {{
+  while (WiFi.status() != WL_CONNECTED) {
+    if (millis() - start > WIFI_TIMEOUT) {
       Serial.println(F(" FAILED"));
       return false;
-    }}
+    }
     delay(500);
     Serial.print('.');
-  }}
+  }
   
   Serial.println(F(" OK"));
   Serial.print(F("IP: "));
   Serial.println(WiFi.localIP());
   return true;
-}}
+}
 
 // === MQTT Management ===
-bool connectMQTT() {{
+bool connectMQTT() {
   if (mqtt.connected()) return true;
   if (!connectWiFi()) return false;
   
@@ -651,118 +746,125 @@ bool connectMQTT() {{
   String clientId = "ESP32-";
   clientId += String(random(0xffff), HEX);
   
-  if (mqtt.connect(clientId.c_str())) {{
+  if (mqtt.connect(clientId.c_str())) {
     Serial.println(F(" OK"));
     return true;
-  }}
+  }
   
   Serial.print(F(" FAILED, rc="));
   Serial.println(mqtt.state());
   return false;
-}}
+}
 
 // === JSON Publishing ===
-void publishData() {{
+void publishData() {
   if (!connectMQTT()) return;
   
   char json[128];
   snprintf(json, sizeof(json),
-    "{{\\"temp\\":%.1f,\\"humidity\\":%.1f,\\"uptime\\":%lu}}",
+    "{\\"temp\\":%.1f,\\"humidity\\":%.1f,\\"uptime\\":%lu}",
     data.temperature, data.humidity, millis() / 1000);
   
-  if (mqtt.publish(MQTT_TOPIC, json)) {{
+  if (mqtt.publish(MQTT_TOPIC, json)) {
     Serial.print(F("Published: "));
     Serial.println(json);
-  }} else {{
+  } else {
     Serial.println(F("Publish failed"));
-  }}
-}}
+  }
+}
 
-void setup() {{
+void setup() {
   Serial.begin(SERIAL_BAUD);
   pinMode(STATUS_LED, OUTPUT);
   dht.begin();
   
   mqtt.setServer(MQTT_SERVER, MQTT_PORT);
   
-  Serial.println(F("=== {project_name} ==="));
+  Serial.println(F("=== " PROJECT_NAME " ==="));
   Serial.println(F("IoT Environmental Logger"));
   
   connectWiFi();
-}}
+}
 
-void loop() {{
+void loop() {
   mqtt.loop();
   
   // Status LED (blink when connected)
   static bool ledState = false;
-  if (WiFi.status() == WL_CONNECTED) {{
-    ledState = !ledState;
+  if (ledTimer.check()) {
+    ledState = (WiFi.status() == WL_CONNECTED) && !ledState;
     digitalWrite(STATUS_LED, ledState);
-  }} else {{
-    digitalWrite(STATUS_LED, LOW);
-  }}
+  }
   
   // Read sensors
-  if (sensorTimer.check()) {{
+  if (sensorTimer.check()) {
     float t = dht.readTemperature();
     float h = dht.readHumidity();
-    if (!isnan(t)) data.temperature = t;
-    if (!isnan(h)) data.humidity = h;
-  }}
+    data.temperature = updateIfValid(data.temperature, t);
+    data.humidity = updateIfValid(data.humidity, h);
+  }
   
   // Publish data
-  if (publishTimer.check()) {{
+  if (publishTimer.check()) {
     publishData();
-  }}
+  }
   
   // Status output
-  if (statusTimer.check()) {{
+  if (statusTimer.check()) {
     Serial.print(F("Temp: "));
     Serial.print(data.temperature, 1);
     Serial.print(F("C, Humidity: "));
     Serial.print(data.humidity, 1);
     Serial.print(F("%, WiFi: "));
     Serial.println(WiFi.status() == WL_CONNECTED ? F("OK") : F("DISCONNECTED"));
-  }}
+  }
   
-  delay(100);
-}}
+  delay(1);  // Yield to the WiFi/MQTT tasks without stalling the loop
+}
 
 #else
-void setup() {{
+void setup() {
   Serial.begin(115200);
   Serial.println(F("ERROR: IoT project requires ESP32 with WiFi"));
   Serial.println(F("Please use --board esp32"));
-}}
-void loop() {{}}
+}
+void loop() {}
 #endif
 '''
 
-    return f"// {project_name} - Generated {datetime.now()}\n// TODO: Implement project type '{project_type}'"
+_MAIN_INO_BODIES = MappingProxyType({
+    "environmental": _ENVIRONMENTAL_MAIN_BODY,
+    "robot": _ROBOT_MAIN_BODY,
+    "iot": _IOT_MAIN_BODY,
+})
 
 
-def generate_platformio_ini(board: str, project_name: str, libraries: List[str]) -> str:
+def generate_main_ino(project_type: str, proj: ProjectType, project_name: str, today: str) -> str:
+    """Generate main.ino for the project type."""
+    header = f"// {project_name} - {proj.name}\n// {proj.description}\n// Generated: {today}\n"
+    return header + _MAIN_INO_BODIES[project_type]
+
+
+def generate_platformio_ini(cfg: BoardConfig, project_name: str, libraries: Sequence[str], today: str) -> str:
     """Generate platformio.ini configuration."""
-    cfg = BOARD_CONFIGS[board]
-    
     lib_deps = "\n".join(f"    {lib}" for lib in libraries) if libraries else "    ; No external libraries"
     
     return f'''; PlatformIO Project Configuration
 ; {project_name}
-; Generated: {datetime.now().strftime("%Y-%m-%d")}
+; Generated: {today}
 
-[env:{cfg["board"]}]
-platform = {cfg["platform"]}
-board = {cfg["board"]}
-framework = {cfg["framework"]}
+[env:{cfg.board}]
+platform = {cfg.platform}
+board = {cfg.board}
+framework = {cfg.framework}
+board_build.f_cpu = {cfg.f_cpu_hz}L
 
 ; Serial monitor
-monitor_speed = {cfg["baud"]}
+monitor_speed = {cfg.baud}
 
 ; Build flags
 build_flags = 
-    -D {cfg["defines"][0]}
+    -D {cfg.defines[0]}
 
 ; Library dependencies
 lib_deps =
@@ -773,28 +875,22 @@ upload_speed = 921600
 '''
 
 
-def generate_readme(project_name: str, project_type: str, board: str) -> str:
+def generate_readme(project_name: str, proj: ProjectType, cfg: BoardConfig, dir_name: str) -> str:
     """Generate README.md for the project."""
-    proj = PROJECT_TYPES[project_type]
-    cfg = BOARD_CONFIGS[board]
-    
-    sensors = "\n".join(f"- {s}" for s in proj.get("sensors", []))
-    features = "\n".join(f"- {f}" for f in proj["features"])
-    
     return f'''# {project_name}
 
-> {proj["description"]}
+> {proj.description}
 
 ## Features
 
-{features}
+{proj.features_md}
 
 ## Hardware Required
 
-**Board:** {cfg["name"]}
+**Board:** {cfg.name}
 
 **Sensors:**
-{sensors}
+{proj.sensors_md}
 
 ## Installation
 
@@ -802,7 +898,7 @@ def generate_readme(project_name: str, project_type: str, board: str) -> str:
 
 ```bash
 # Clone/download this project
-cd {project_name.lower().replace(" ", "-")}
+cd {dir_name}
 
 # Build and upload
 pio run -t upload
@@ -814,7 +910,7 @@ pio device monitor
 ### Arduino IDE
 
 1. Open `src/main.ino`
-2. Select board: **{cfg["name"]}**
+2. Select board: **{cfg.name}**
 3. Install required libraries from Library Manager
 4. Upload
 
@@ -829,12 +925,12 @@ Edit `src/config.h` to customize:
 
 1. Connect hardware according to pin definitions
 2. Upload firmware
-3. Open Serial Monitor at {cfg["baud"]} baud
+3. Open Serial Monitor at {cfg.baud} baud
 4. Press button to start/stop (if applicable)
 
 ## Troubleshooting
 
-- **No serial output:** Check baud rate ({cfg["baud"]})
+- **No serial output:** Check baud rate ({cfg.baud})
 - **Sensor not detected:** Verify wiring and I2C address
 - **WiFi connection fails:** Check credentials in config.h
 
@@ -851,6 +947,30 @@ Generated by Arduino Project Builder
 # Project Scaffolding
 # =============================================================================
 
+GITIGNORE = '''.pio/
+.vscode/
+*.o
+*.elf
+*.hex
+'''
+
+
+def _safe_name(project_name: str) -> str:
+    """Default directory name for a project."""
+    return project_name.lower().replace(" ", "-")
+
+
+def _validate(project_type: str, board: str) -> Optional[str]:
+    """Return an error message for an invalid type/board combination, or None."""
+    proj = PROJECT_TYPES.get(project_type)
+    if proj is None:
+        return f"Error: Unknown project type '{project_type}'"
+    if board not in BOARD_CONFIGS:
+        return f"Error: Unknown board '{board}'"
+    if proj.board_requirement and board != proj.board_requirement:
+        return f"Error: {proj.name} requires {proj.board_requirement} board"
+    return None
+
 
 def scaffold_project(
     project_name: str,
@@ -860,76 +980,46 @@ def scaffold_project(
 ) -> str:
     """Create complete project directory structure."""
     
-    # Validate inputs
-    if project_type not in PROJECT_TYPES:
-        return f"Error: Unknown project type '{project_type}'"
-    if board not in BOARD_CONFIGS:
-        return f"Error: Unknown board '{board}'"
-    
-    # Check board requirement
+    error = _validate(project_type, board)
+    if error:
+        return error
     proj = PROJECT_TYPES[project_type]
-    if "board_requirement" in proj and board != proj["board_requirement"]:
-        return f"Error: {proj['name']} requires {proj['board_requirement']} board"
-    
-    # Create output directory
-    safe_name = project_name.lower().replace(" ", "-")
-    if output_dir:
-        base_path = Path(output_dir)
-    else:
-        base_path = Path(safe_name)
-    
-    src_path = base_path / "src"
+    cfg = BOARD_CONFIGS[board]
+    base_path = Path(output_dir) if output_dir else Path(_safe_name(project_name))
     
+    # Render every file before touching the filesystem
+    today = datetime.now().strftime("%Y-%m-%d")
+    files = {
+        "src/config.h": generate_config_h(project_type, proj, project_name, today),
+        "src/timing.h": generate_timing_h(project_type, today),
+        "src/main.ino": generate_main_ino(project_type, proj, project_name, today),
+        "platformio.ini": generate_platformio_ini(cfg, project_name, proj.libraries, today),
+        "README.md": generate_readme(project_name, proj, cfg, base_path.resolve().name),
+        ".gitignore": GITIGNORE,
+    }
+
     try:
-        base_path.mkdir(parents=True, exist_ok=True)
-        src_path.mkdir(exist_ok=True)
+        (base_path / "src").mkdir(parents=True, exist_ok=True)
         
-        # Generate files
         files_created = []
+        for rel_path, content in files.items():
+            (base_path / rel_path).write_bytes(content.encode("utf-8"))
+            files_created.append(rel_path)
         
-        # config.h
-        config_content = generate_config_h(project_type, board, project_name)
-        (src_path / "config.h").write_text(config_content)
-        files_created.append("src/config.h")
-        
-        # main.ino
-        main_content = generate_main_ino(project_type, board, project_name)
-        (src_path / "main.ino").write_text(main_content)
-        files_created.append("src/main.ino")
-        
-        # platformio.ini
-        libraries = proj.get("libraries", [])
-        pio_content = generate_platformio_ini(board, project_name, libraries)
-        (base_path / "platformio.ini").write_text(pio_content)
-        files_created.append("platformio.ini")
-        
-        # README.md
-        readme_content = generate_readme(project_name, project_type, board)
-        (base_path / "README.md").write_text(readme_content)
-        files_created.append("README.md")
-        
-        # .gitignore
-        gitignore = '''.pio/
-.vscode/
-*.o
-*.elf
-*.hex
-'''
-        (base_path / ".gitignore").write_text(gitignore)
-        files_created.append(".gitignore")
-        
-        result = f"✓ Created project: {project_name}\n"
-        result += f"  Location: {base_path.absolute()}\n"
-        result += f"  Type: {proj['name']}\n"
-        result += f"  Board: {BOARD_CONFIGS[board]['name']}\n"
-        result += f"  Files created:\n"
-        for f in files_created:
-            result += f"    - {f}\n"
-        result += f"\nNext steps:\n"
-        result += f"  cd {base_path}\n"
-        result += f"  pio run -t upload\n"
-        
-        return result
+        lines = [
+            f"✓ Created project: {project_name}",
+            f"  Location: {base_path.absolute()}",
+            f"  Type: {proj.name}",
+            f"  Board: {cfg.name}",
+            "  Files created:",
+            *(f"    - {f}" for f in files_created),
+            "",
+            "Next steps:",
+            f"  cd {base_path}",
+            "  pio run -t upload",
+            "",
+        ]
+        return "\n".join(lines)
         
     except Exception as e:
         return f"Error creating project: {e}"
@@ -939,66 +1029,60 @@ def list_project_types():
     """List available project types."""
     print("\n=== Available Project Types ===\n")
     for key, proj in PROJECT_TYPES.items():
-        req = f" (requires {proj['board_requirement']})" if "board_requirement" in proj else ""
-        print(f"  {key:15} - {proj['name']}{req}")
-        print(f"                   {proj['description']}")
+        req = f" (requires {proj.board_requirement})" if proj.board_requirement else ""
+        print(f"  {key:15} - {proj.name}{req}")
+        print(f"                   {proj.description}")
         print()
     
     print("=== Supported Boards ===\n")
     for key, cfg in BOARD_CONFIGS.items():
-        print(f"  {key:10} - {cfg['name']} ({cfg['sram']} bytes SRAM)")
+        print(f"  {key:10} - {cfg.name} ({cfg.sram} bytes SRAM)")
     print()
 
 
+def _ask(prompt: str, default: str = "") -> str:
+    """Read a stripped answer, falling back to default when empty or at EOF."""
+    try:
+        return input(prompt).strip() or default
+    except EOFError:
+        return default
+
+
+def _prompt_choice(label: str, items: Sequence[str]) -> str:
+    """Prompt until the user picks one of the numbered items (default: first)."""
+    lut = {str(i): item for i, item in enumerate(items, 1)}
+    while True:
+        choice = _ask(f"\nSelect {label} (1-{len(items)}) [1]: ", "1")
+        if choice in lut:
+            return lut[choice]
+        print("Invalid choice, try again.")
+
+
 def interactive_mode():
     """Interactive project creation wizard."""
     print("\n🔧 Arduino Project Builder - Interactive Mode\n")
     
     # Get project name
-    project_name = input("Project name: ").strip()
-    if not project_name:
-        project_name = "MyArduinoProject"
+    project_name = _ask("Project name: ", "MyArduinoProject")
     
     # Select project type
     print("\nAvailable project types:")
     types_list = list(PROJECT_TYPES.keys())
     for i, t in enumerate(types_list, 1):
         proj = PROJECT_TYPES[t]
-        print(f"  {i}. {t} - {proj['name']}")
-    
-    while True:
-        try:
-            choice = input("\nSelect type (1-3): ").strip()
-            idx = int(choice) - 1
-            if 0 <= idx < len(types_list):
-                project_type = types_list[idx]
-                break
-        except ValueError:
-            pass
-        print("Invalid choice, try again.")
+        print(f"  {i}. {t} - {proj.name}")
+    project_type = _prompt_choice("type", types_list)
     
     # Select board
     print("\nAvailable boards:")
     boards_list = list(BOARD_CONFIGS.keys())
     for i, b in enumerate(boards_list, 1):
         cfg = BOARD_CONFIGS[b]
-        print(f"  {i}. {b} - {cfg['name']}")
-    
-    while True:
-        try:
-            choice = input("\nSelect board (1-3): ").strip()
-            idx = int(choice) - 1
-            if 0 <= idx < len(boards_list):
-                board = boards_list[idx]
-                break
-        except ValueError:
-            pass
-        print("Invalid choice, try again.")
+        print(f"  {i}. {b} - {cfg.name}")
+    board = _prompt_choice("board", boards_list)
     
     # Output directory
-    output_dir = input(f"\nOutput directory (default: ./{project_name.lower().replace(' ', '-')}): ").strip()
-    if not output_dir:
-        output_dir = None
+    output_dir = _ask(f"\nOutput directory (default: ./{_safe_name(project_name)}): ") or None
     
     # Create project
     print("\n" + "=" * 60)
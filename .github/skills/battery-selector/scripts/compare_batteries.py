@@ -13,12 +13,19 @@ Usage:
     uv run compare_batteries.py --interactive
     uv run compare_batteries.py --current 50 --hours 24 --rechargeable
     uv run compare_batteries.py --project weather_station
+
+Library use (parameter sweeps):
+    scores = evaluate_all_sweep([ProjectRequirements(average_current_ma=i) for i in (10, 50, 200)])
+    top_batteries_per_row(scores, top_n=3)
 """
 
-import argparse
-import json
-from dataclasses import dataclass
-from typing import List, Optional
+import heapq
+import math
+import sys
+from bisect import bisect_left
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple
 
 # =============================================================================
 # Battery Database
@@ -243,7 +250,88 @@ BATTERY_DATABASE = {
 }
 
 
-@dataclass
+def normalize_dimensions(dims: dict) -> Tuple[bool, float, float, float]:
+    """Flatten a dimensions_mm dict to (is_cylindrical, a, b, c) in mm
+
+    Cylinders give (diameter, length, 0); boxes give (width, height, depth).
+    """
+    if "diameter" in dims:
+        return True, dims["diameter"], dims.get("length", dims.get("height", 0)), 0
+    return False, dims.get("width", 0), dims.get("height", 0), dims.get("depth", dims.get("thickness", 0))
+
+
+def calculate_volume(is_cylindrical: bool, a: float, b: float, c: float) -> float:
+    """Calculate volume in cc from normalized dimensions (mm)"""
+    mm3 = math.pi * a * a * 0.25 * b if is_cylindrical else a * b * c
+    return mm3 * 1e-3
+
+
+# Chemistry codes, so scoring compares small ints instead of strings
+CHEM_TO_CODE = {
+    "Alkaline": 0,
+    "Lithium Primary": 1,
+    "NiMH": 2,
+    "NiMH Low Self-Discharge": 3,
+    "Li-ion": 4,
+    "LiPo": 5,
+    "LiFePO4": 6,
+}
+CHEM_LITHIUM_PRIMARY = CHEM_TO_CODE["Lithium Primary"]
+
+
+@dataclass(frozen=True, slots=True)
+class BatterySpec:
+    """Scoring fields of one BATTERY_DATABASE entry"""
+    name: str
+    chemistry: str
+    chem_code: int
+    voltage: float
+    capacity_mah: float
+    energy_wh: float
+    weight_g: float
+    cost_usd: float
+    cycle_life: int
+    temp_min_c: float
+    temp_max_c: float
+    rechargeable: bool
+    is_cylindrical: bool
+    dims_mm: Tuple[float, float, float]
+    volume_cc: float
+    cost_per_wh: float
+    wh_per_g: float
+
+
+def _build_spec(name: str, b: dict) -> BatterySpec:
+    """Flatten one database entry into a typed record"""
+    is_cylindrical, *dims = normalize_dimensions(b["dimensions_mm"])
+    return BatterySpec(
+        name=name,
+        chemistry=b["chemistry"],
+        chem_code=CHEM_TO_CODE[b["chemistry"]],
+        voltage=b["voltage_nominal"],
+        capacity_mah=b["capacity_mah"],
+        energy_wh=b["energy_wh"],
+        weight_g=b["weight_g"],
+        cost_usd=b["cost_usd"],
+        cycle_life=b["cycle_life"],
+        temp_min_c=b["temp_range_c"][0],
+        temp_max_c=b["temp_range_c"][1],
+        rechargeable=b["rechargeable"],
+        is_cylindrical=is_cylindrical,
+        dims_mm=tuple(dims),
+        volume_cc=calculate_volume(is_cylindrical, *dims),
+        cost_per_wh=b["cost_usd"] / b["energy_wh"],
+        wh_per_g=b["energy_wh"] / b["weight_g"],
+    )
+
+
+# Scoring reads these records, with the derived volume and cost/energy ratios
+# computed once here. BATTERY_DATABASE stays the source of truth and is still
+# used for the human-readable parts of the report (pros/cons).
+BATTERY_SPECS = tuple(_build_spec(name, b) for name, b in BATTERY_DATABASE.items())
+
+
+@dataclass(frozen=True, slots=True)
 class ProjectRequirements:
     """Project power requirements"""
     average_current_ma: float
@@ -260,199 +348,272 @@ class ProjectRequirements:
     cycle_count_target: int = 1
 
 
-def calculate_runtime(battery: dict, current_ma: float) -> float:
+# Simple Peukert approximation: usable fraction of the rated capacity by
+# C-rate band. A C-rate above _PEUKERT_C_RATES[i] selects _PEUKERT_FACTORS[i + 1].
+_PEUKERT_C_RATES = (0.2, 0.5, 1.0)
+_PEUKERT_FACTORS = (0.95, 0.9, 0.8, 0.6)  # last entry: high drain penalty
+
+
+@dataclass(frozen=True, slots=True)
+class BatteryResult:
+    """Evaluation of one battery against the requirements (unrounded values)"""
+    name: str
+    chemistry: str
+    voltage: float
+    capacity_mah: float
+    energy_wh: float
+    score: float
+    issues: Tuple[str, ...]
+    suitable: bool
+    runtime_hours: float
+    volume_cc: float
+    cost_per_wh: float
+    wh_per_g: float
+    
+    @property
+    def status(self) -> str:
+        """Table marker for suitability"""
+        return "✓" if self.suitable else "✗"
+    
+    @property
+    def issues_summary(self) -> str:
+        """First two issues for the comparison table"""
+        return "; ".join(self.issues[:2]) if self.issues else "✓ Meets requirements"
+
+
+def calculate_runtime(capacity: float, current_ma: float) -> float:
     """Calculate runtime in hours, accounting for Peukert effect"""
-    capacity = battery["capacity_mah"]
-    
-    # Simple Peukert approximation
-    c_rate = current_ma / capacity
-    if c_rate > 1.0:
-        effective_capacity = capacity * 0.6  # High drain penalty
-    elif c_rate > 0.5:
-        effective_capacity = capacity * 0.8
-    elif c_rate > 0.2:
-        effective_capacity = capacity * 0.9
-    else:
-        effective_capacity = capacity * 0.95
-    
-    return effective_capacity / current_ma if current_ma > 0 else float('inf')
+    if current_ma <= 0:
+        return float('inf')
+    factor = _PEUKERT_FACTORS[bisect_left(_PEUKERT_C_RATES, current_ma / capacity)]
+    return capacity * factor / current_ma
 
 
-def calculate_volume(dims: dict) -> float:
-    """Calculate volume in cc from dimensions"""
-    if "diameter" in dims:
-        # Cylindrical
-        r = dims["diameter"] / 2 / 10  # mm to cm
-        h = dims.get("length", dims.get("height", 0)) / 10
-        return 3.14159 * r * r * h
-    else:
-        # Rectangular
-        w = dims.get("width", 0) / 10
-        h = dims.get("height", 0) / 10
-        d = dims.get("depth", dims.get("thickness", 0)) / 10
-        return w * h * d
-
-
-def evaluate_battery(battery_name: str, battery: dict, req: ProjectRequirements) -> dict:
-    """Evaluate a battery against requirements"""
-    result = {
-        "name": battery_name,
-        "chemistry": battery["chemistry"],
-        "voltage": battery["voltage_nominal"],
-        "capacity_mah": battery["capacity_mah"],
-        "energy_wh": battery["energy_wh"],
-        "score": 100,
-        "issues": [],
-        "suitable": True
-    }
-    
-    # Voltage check
-    if battery["voltage_nominal"] < req.min_voltage:
-        result["issues"].append(f"Voltage too low ({battery['voltage_nominal']}V < {req.min_voltage}V)")
-        result["score"] -= 50
-    if battery["voltage_nominal"] > req.max_voltage:
-        result["issues"].append(f"Voltage too high ({battery['voltage_nominal']}V > {req.max_voltage}V)")
-        result["score"] -= 30
-    
-    # Runtime check
-    runtime = calculate_runtime(battery, req.average_current_ma)
-    result["runtime_hours"] = round(runtime, 2)
-    
-    if runtime < req.target_runtime_hours:
+# Issue flags set by check_battery(). The matching messages are only built,
+# by _issue_messages(), for batteries that make it into a report.
+ISSUE_VOLTAGE_LOW = 1 << 0
+ISSUE_VOLTAGE_HIGH = 1 << 1
+ISSUE_RUNTIME_SHORT = 1 << 2
+ISSUE_NOT_RECHARGEABLE = 1 << 3
+ISSUE_CYCLE_LIFE = 1 << 4
+ISSUE_TOO_HEAVY = 1 << 5
+ISSUE_TOO_LARGE = 1 << 6
+ISSUE_TOO_COLD = 1 << 7
+ISSUE_TOO_HOT = 1 << 8
+ISSUE_OVER_BUDGET = 1 << 9
+ISSUE_PEAK_CURRENT = 1 << 10
+
+
+def check_battery(battery: BatterySpec, req: ProjectRequirements) -> Tuple[float, int]:
+    """Score a battery against requirements and flag the ones it misses"""
+    score = 100
+    flags = 0
+    
+    if battery.voltage < req.min_voltage:
+        flags |= ISSUE_VOLTAGE_LOW
+        score -= 50
+    if battery.voltage > req.max_voltage:
+        flags |= ISSUE_VOLTAGE_HIGH
+        score -= 30
+    
+    # Runtime: up to +20 for headroom, up to -50 for a shortfall. At most one
+    # of the two clamped terms is non-zero.
+    ratio = calculate_runtime(battery.capacity_mah, req.average_current_ma) / req.target_runtime_hours
+    if ratio < 1:
+        flags |= ISSUE_RUNTIME_SHORT
+    score += min(20, max(0.0, ratio - 1) * 10) - min(50, max(0.0, 1 - ratio) * 50)
+    
+    if req.rechargeable_required and not battery.rechargeable:
+        flags |= ISSUE_NOT_RECHARGEABLE
+        score -= 100
+    if battery.cycle_life < req.cycle_count_target:
+        flags |= ISSUE_CYCLE_LIFE
+        score -= 30
+    if req.max_weight_g and battery.weight_g > req.max_weight_g:
+        flags |= ISSUE_TOO_HEAVY
+        score -= 20
+    if req.max_volume_cc and battery.volume_cc > req.max_volume_cc:
+        flags |= ISSUE_TOO_LARGE
+        score -= 20
+    if req.min_temp_c < battery.temp_min_c:
+        flags |= ISSUE_TOO_COLD
+        score -= 20
+    if req.max_temp_c > battery.temp_max_c:
+        flags |= ISSUE_TOO_HOT
+        score -= 20
+    if req.max_cost_usd and battery.cost_usd > req.max_cost_usd:
+        flags |= ISSUE_OVER_BUDGET
+        score -= 15
+    # LiPo/Li-ion can handle high peaks, coin cells cannot
+    if req.peak_current_ma and req.peak_current_ma > 5 and battery.chem_code == CHEM_LITHIUM_PRIMARY:
+        flags |= ISSUE_PEAK_CURRENT
+        score -= 40
+    
+    return score, flags
+
+
+def score_battery(battery: BatterySpec, req: ProjectRequirements) -> float:
+    """Score a battery against requirements (higher is better)"""
+    return check_battery(battery, req)[0]
+
+
+def _issue_messages(flags: int, battery: BatterySpec, req: ProjectRequirements, runtime: float) -> Tuple[str, ...]:
+    """Human-readable text for the issue flags from check_battery()"""
+    issues = []
+    if flags & ISSUE_VOLTAGE_LOW:
+        issues.append(f"Voltage too low ({battery.voltage}V < {req.min_voltage}V)")
+    if flags & ISSUE_VOLTAGE_HIGH:
+        issues.append(f"Voltage too high ({battery.voltage}V > {req.max_voltage}V)")
+    if flags & ISSUE_RUNTIME_SHORT:
         deficit_pct = (1 - runtime / req.target_runtime_hours) * 100
-        result["issues"].append(f"Runtime {runtime:.1f}h < target {req.target_runtime_hours}h ({deficit_pct:.0f}% short)")
-        result["score"] -= min(50, deficit_pct / 2)
-    else:
-        bonus = min(20, (runtime / req.target_runtime_hours - 1) * 10)
-        result["score"] += bonus
-    
-    # Rechargeable check
-    if req.rechargeable_required and not battery["rechargeable"]:
-        result["issues"].append("Not rechargeable (required)")
-        result["score"] -= 100
-        result["suitable"] = False
-    
-    # Cycle life check
-    if battery["cycle_life"] < req.cycle_count_target:
-        result["issues"].append(f"Cycle life {battery['cycle_life']} < required {req.cycle_count_target}")
-        result["score"] -= 30
-    
-    # Weight check
-    if req.max_weight_g and battery["weight_g"] > req.max_weight_g:
-        result["issues"].append(f"Too heavy ({battery['weight_g']}g > {req.max_weight_g}g)")
-        result["score"] -= 20
-    
-    # Volume check
-    volume = calculate_volume(battery["dimensions_mm"])
-    result["volume_cc"] = round(volume, 2)
-    if req.max_volume_cc and volume > req.max_volume_cc:
-        result["issues"].append(f"Too large ({volume:.1f}cc > {req.max_volume_cc}cc)")
-        result["score"] -= 20
-    
-    # Temperature check
-    temp_range = battery["temp_range_c"]
-    if req.min_temp_c < temp_range[0]:
-        result["issues"].append(f"Cold temp limit {temp_range[0]}°C > required {req.min_temp_c}°C")
-        result["score"] -= 20
-    if req.max_temp_c > temp_range[1]:
-        result["issues"].append(f"Hot temp limit {temp_range[1]}°C < required {req.max_temp_c}°C")
-        result["score"] -= 20
-    
-    # Cost check
-    if req.max_cost_usd and battery["cost_usd"] > req.max_cost_usd:
-        result["issues"].append(f"Cost ${battery['cost_usd']:.2f} > budget ${req.max_cost_usd:.2f}")
-        result["score"] -= 15
-    
-    # Peak current check (LiPo/Li-ion can handle high peaks, coin cells cannot)
-    if req.peak_current_ma:
-        if battery["chemistry"] == "Lithium Primary" and req.peak_current_ma > 5:
-            result["issues"].append(f"Coin cell can't handle {req.peak_current_ma}mA peaks")
-            result["score"] -= 40
-    
-    result["cost_per_wh"] = round(battery["cost_usd"] / battery["energy_wh"], 3)
-    result["wh_per_g"] = round(battery["energy_wh"] / battery["weight_g"], 4)
-    
-    if result["score"] < 0:
-        result["suitable"] = False
-    
-    return result
+        issues.append(f"Runtime {runtime:.1f}h < target {req.target_runtime_hours}h ({deficit_pct:.0f}% short)")
+    if flags & ISSUE_NOT_RECHARGEABLE:
+        issues.append("Not rechargeable (required)")
+    if flags & ISSUE_CYCLE_LIFE:
+        issues.append(f"Cycle life {battery.cycle_life} < required {req.cycle_count_target}")
+    if flags & ISSUE_TOO_HEAVY:
+        issues.append(f"Too heavy ({battery.weight_g}g > {req.max_weight_g}g)")
+    if flags & ISSUE_TOO_LARGE:
+        issues.append(f"Too large ({battery.volume_cc:.1f}cc > {req.max_volume_cc}cc)")
+    if flags & ISSUE_TOO_COLD:
+        issues.append(f"Cold temp limit {battery.temp_min_c}°C > required {req.min_temp_c}°C")
+    if flags & ISSUE_TOO_HOT:
+        issues.append(f"Hot temp limit {battery.temp_max_c}°C < required {req.max_temp_c}°C")
+    if flags & ISSUE_OVER_BUDGET:
+        issues.append(f"Cost ${battery.cost_usd:.2f} > budget ${req.max_cost_usd:.2f}")
+    if flags & ISSUE_PEAK_CURRENT:
+        issues.append(f"Coin cell can't handle {req.peak_current_ma}mA peaks")
+    return tuple(issues)
 
 
-def find_best_batteries(req: ProjectRequirements, top_n: int = 5) -> List[dict]:
+def evaluate_battery(battery: BatterySpec, req: ProjectRequirements,
+                     checked: Optional[Tuple[float, int]] = None) -> BatteryResult:
+    """Evaluate a battery against requirements, with the reasons for its score
+
+    Pass the (score, flags) pair from check_battery() as checked to avoid
+    running the checks again.
+    """
+    score, flags = checked or check_battery(battery, req)
+    runtime = calculate_runtime(battery.capacity_mah, req.average_current_ma)
+    return BatteryResult(
+        name=battery.name,
+        chemistry=battery.chemistry,
+        voltage=battery.voltage,
+        capacity_mah=battery.capacity_mah,
+        energy_wh=battery.energy_wh,
+        score=score,
+        issues=_issue_messages(flags, battery, req, runtime),
+        suitable=not flags & ISSUE_NOT_RECHARGEABLE and score >= 0,
+        runtime_hours=runtime,
+        volume_cc=battery.volume_cc,
+        cost_per_wh=battery.cost_per_wh,
+        wh_per_g=battery.wh_per_g,
+    )
+
+
+def find_best_batteries(req: ProjectRequirements, top_n: int = 5) -> List[BatteryResult]:
     """Find the best batteries for the requirements"""
-    results = []
-    
-    for name, battery in BATTERY_DATABASE.items():
-        result = evaluate_battery(name, battery, req)
-        results.append(result)
-    
-    # Sort by score descending
-    results.sort(key=lambda x: x["score"], reverse=True)
-    
-    return results[:top_n]
+    return list(_find_best_cached(req, top_n))
 
 
-def generate_comparison_table(results: List[dict]) -> str:
-    """Generate markdown comparison table"""
-    lines = [
-        "| Battery | Chemistry | Voltage | Runtime (h) | Score | Issues |",
-        "|---------|-----------|---------|-------------|-------|--------|"
-    ]
+# Requirements are frozen (hashable), so repeated queries with the same
+# values, e.g. while exploring interactively, are answered from the cache.
+@lru_cache(maxsize=128)
+def _find_best_cached(req: ProjectRequirements, top_n: int) -> Tuple[BatteryResult, ...]:
+    """Rank the catalog and evaluate the top_n batteries"""
+    # Rank on (score, issue flags) pairs; issue strings and result records
+    # are only built for the batteries that make the cut.
+    checked = [check_battery(battery, req) for battery in BATTERY_SPECS]
+    scores = [score for score, _ in checked]
+    return tuple(
+        evaluate_battery(BATTERY_SPECS[i], req, checked[i]) for i in _top_indices(scores, top_n)
+    )
+
+
+def _top_indices(scores: Sequence[float], top_n: int) -> List[int]:
+    """Indices of the top_n scores, best first"""
+    # Ties keep database order, like a stable sort
+    return heapq.nlargest(top_n, range(len(scores)), key=scores.__getitem__)
+
+
+def evaluate_all_sweep(reqs: Iterable[ProjectRequirements]) -> List[List[float]]:
+    """Score matrix for a parameter sweep
+
+    One row per requirement set, one column per battery in BATTERY_SPECS
+    order. Only numeric scores are computed; use evaluate_battery() for the
+    details of a particular cell.
+    """
+    specs = BATTERY_SPECS
+    return [[score_battery(battery, req) for battery in specs] for req in reqs]
+
+
+def top_batteries_per_row(scores: List[List[float]], top_n: int = 5) -> List[List[str]]:
+    """Names of the top_n batteries for each row of a sweep score matrix"""
+    return [[BATTERY_SPECS[i].name for i in _top_indices(row, top_n)] for row in scores]
+
+
+_ROW_FMT = (
+    "| {r.name} | {r.chemistry} | {r.voltage}V | "
+    "{r.runtime_hours:.1f} | {r.score:.0f} {r.status} | {r.issues_summary} |"
+)
+
+
+def _table_rows(results: List[BatteryResult]) -> Iterator[str]:
+    """Yield the markdown comparison table, one line at a time"""
+    yield "| Battery | Chemistry | Voltage | Runtime (h) | Score | Issues |"
+    yield "|---------|-----------|---------|-------------|-------|--------|"
     
     for r in results:
-        issues = "; ".join(r["issues"][:2]) if r["issues"] else "✓ Meets requirements"
-        status = "✓" if r["suitable"] else "✗"
-        lines.append(
-            f"| {r['name']} | {r['chemistry']} | {r['voltage']}V | "
-            f"{r['runtime_hours']:.1f} | {r['score']:.0f} {status} | {issues} |"
-        )
-    
-    return "\n".join(lines)
+        yield _ROW_FMT.format(r=r)
 
 
-def generate_report(req: ProjectRequirements, results: List[dict]) -> str:
-    """Generate full battery selection report"""
-    lines = [
-        "# Battery Selection Report",
-        "",
-        "## Requirements",
-        f"- Average Current: {req.average_current_ma} mA",
-        f"- Target Runtime: {req.target_runtime_hours} hours",
-        f"- Voltage Range: {req.min_voltage}V - {req.max_voltage}V",
-        f"- Rechargeable: {'Required' if req.rechargeable_required else 'Optional'}",
-        f"- Temperature Range: {req.min_temp_c}°C to {req.max_temp_c}°C",
-        "",
-        "## Top Recommendations",
-        "",
-        generate_comparison_table(results),
-        ""
-    ]
+def generate_comparison_table(results: List[BatteryResult]) -> str:
+    """Generate markdown comparison table"""
+    return "\n".join(_table_rows(results))
+
+
+def _report_lines(req: ProjectRequirements, results: List[BatteryResult]) -> Iterator[str]:
+    """Yield the battery selection report, one line at a time"""
+    yield "# Battery Selection Report"
+    yield ""
+    yield "## Requirements"
+    yield f"- Average Current: {req.average_current_ma} mA"
+    yield f"- Target Runtime: {req.target_runtime_hours} hours"
+    yield f"- Voltage Range: {req.min_voltage}V - {req.max_voltage}V"
+    yield f"- Rechargeable: {'Required' if req.rechargeable_required else 'Optional'}"
+    yield f"- Temperature Range: {req.min_temp_c}°C to {req.max_temp_c}°C"
+    yield ""
+    yield "## Top Recommendations"
+    yield ""
+    yield from _table_rows(results)
+    yield ""
     
     # Detailed analysis of top choice
-    if results and results[0]["suitable"]:
+    if results and results[0].suitable:
         top = results[0]
-        battery = BATTERY_DATABASE[top["name"]]
-        lines.extend([
-            f"## Recommended: {top['name']}",
-            "",
-            f"**Chemistry:** {top['chemistry']}",
-            f"**Nominal Voltage:** {top['voltage']}V",
-            f"**Capacity:** {top['capacity_mah']} mAh ({battery['energy_wh']} Wh)",
-            f"**Expected Runtime:** {top['runtime_hours']:.1f} hours",
-            f"**Weight:** {battery['weight_g']}g",
-            f"**Cost:** ${battery['cost_usd']:.2f}",
-            "",
-            "**Pros:**",
-        ])
+        battery = BATTERY_DATABASE[top.name]
+        yield f"## Recommended: {top.name}"
+        yield ""
+        yield f"**Chemistry:** {top.chemistry}"
+        yield f"**Nominal Voltage:** {top.voltage}V"
+        yield f"**Capacity:** {top.capacity_mah} mAh ({battery['energy_wh']} Wh)"
+        yield f"**Expected Runtime:** {top.runtime_hours:.1f} hours"
+        yield f"**Weight:** {battery['weight_g']}g"
+        yield f"**Cost:** ${battery['cost_usd']:.2f}"
+        yield ""
+        yield "**Pros:**"
         for pro in battery.get("pros", []):
-            lines.append(f"- {pro}")
+            yield f"- {pro}"
         
-        lines.append("")
-        lines.append("**Cons:**")
+        yield ""
+        yield "**Cons:**"
         for con in battery.get("cons", []):
-            lines.append(f"- {con}")
-    
-    return "\n".join(lines)
+            yield f"- {con}"
+
+
+def generate_report(req: ProjectRequirements, results: List[BatteryResult]) -> str:
+    """Generate full battery selection report"""
+    return "\n".join(_report_lines(req, results))
 
 
 def interactive_mode():
@@ -510,7 +671,19 @@ def interactive_mode():
         print(f"Saved to: {filename}")
 
 
+def _to_json(data) -> str:
+    """Serialize to indented JSON, using orjson when it is installed"""
+    try:
+        import orjson
+    except ImportError:
+        import json
+        return json.dumps(data, indent=2, ensure_ascii=False)
+    return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode()
+
+
 def main():
+    import argparse
+    
     parser = argparse.ArgumentParser(description="Battery Selector for Embedded Projects")
     parser.add_argument("--interactive", "-i", action="store_true", help="Interactive mode")
     parser.add_argument("--current", "-c", type=float, help="Average current (mA)")
@@ -519,16 +692,17 @@ def main():
     parser.add_argument("--min-voltage", type=float, default=3.0, help="Min voltage")
     parser.add_argument("--max-voltage", type=float, default=5.0, help="Max voltage")
     parser.add_argument("--list", "-l", action="store_true", help="List all batteries")
-    parser.add_argument("--json", "-j", action="store_true", help="Output as JSON")
+    parser.add_argument("--json", "-j", action="store_true", help="Output as JSON (full-precision numbers)")
     
     args = parser.parse_args()
     
     if args.list:
-        print("Battery Database:")
-        print("-" * 80)
-        for name, b in BATTERY_DATABASE.items():
-            print(f"{name:20} {b['chemistry']:15} {b['voltage_nominal']}V "
-                  f"{b['capacity_mah']:5}mAh ${b['cost_usd']:.2f}")
+        rows = [
+            f"{name:20} {b['chemistry']:15} {b['voltage_nominal']}V "
+            f"{b['capacity_mah']:5}mAh ${b['cost_usd']:.2f}"
+            for name, b in BATTERY_DATABASE.items()
+        ]
+        sys.stdout.write("Battery Database:\n" + "-" * 80 + "\n" + "\n".join(rows) + "\n")
         return
     
     if args.interactive:
@@ -547,7 +721,7 @@ def main():
         results = find_best_batteries(req)
         
         if args.json:
-            print(json.dumps(results, indent=2))
+            print(_to_json([asdict(r) for r in results]))
         else:
             print(generate_report(req, results))
         return
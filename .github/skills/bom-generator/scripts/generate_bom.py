@@ -24,28 +24,34 @@ import argparse
 import json
 import csv
 import sys
+from collections import defaultdict
 from dataclasses import dataclass, field
 from typing import Optional, List
 from pathlib import Path
+from types import MappingProxyType
 from datetime import datetime
+from itertools import chain
+from math import fsum
+from importlib.util import find_spec
 
-# Check for openpyxl
-try:
-    from openpyxl import Workbook
-    from openpyxl.styles import Font, Alignment, Border, Side, PatternFill
-    from openpyxl.utils import get_column_letter
-    OPENPYXL_AVAILABLE = True
-except ImportError:
-    OPENPYXL_AVAILABLE = False
+# Check for openpyxl (imported in to_xlsx, only when a workbook is written)
+OPENPYXL_AVAILABLE = find_spec("openpyxl") is not None
+if not OPENPYXL_AVAILABLE:
     print("Warning: openpyxl not installed. xlsx output disabled.", file=sys.stderr)
     print("Install with: pip install openpyxl", file=sys.stderr)
 
+# orjson is optional; BOM.to_json_bytes falls back to the json module
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
 # =============================================================================
 # Component Database
 # =============================================================================
 
-COMPONENT_DATABASE = {
+COMPONENT_DATABASE = MappingProxyType({
     # Microcontrollers
     "ESP32-DevKit": {
         "description": "ESP32 Development Board with WiFi/BLE",
@@ -307,10 +313,54 @@ COMPONENT_DATABASE = {
             "Amazon": "https://amazon.com/dp/B07GD2BWPY"
         }
     }
+})
+
+# Shared read-only default for entries without suppliers (never mutated)
+_EMPTY = MappingProxyType({})
+
+# Default (supplier, link) per component: the first supplier listed
+_FIRST_SUPPLIER = {
+    name: next(iter(comp["suppliers"].items())) if comp.get("suppliers") else ("", "")
+    for name, comp in COMPONENT_DATABASE.items()
+}
+
+# --list output, rendered once
+_LIST_TABLE = "Component Database:\n" + "-" * 80 + "\n" + "".join(
+    f"{name:25} ${comp['unit_price_usd']:6.2f}  {comp['description']}\n"
+    for name, comp in COMPONENT_DATABASE.items()
+)
+
+# Per-component (description, category, unit price, package, suppliers), so
+# add_from_database resolves a name with one lookup and no .get() defaults
+_DB_ITEM_FIELDS = {
+    name: (comp["description"], comp["category"], comp["unit_price_usd"],
+           comp.get("package", ""), comp.get("suppliers") or _EMPTY)
+    for name, comp in COMPONENT_DATABASE.items()
 }
 
+# Interactive mode: component numbers map into this tuple
+_DB_NAMES = tuple(COMPONENT_DATABASE)
+_DB_MENU = "\n".join(f"  {i:2}. {name}" for i, name in enumerate(_DB_NAMES, 1))
+
 
-@dataclass
+# =============================================================================
+# Export Layout
+# =============================================================================
+
+# BOMs with more items than this are written through to_xlsx_streaming
+XLSX_STREAMING_THRESHOLD = 500
+
+_XLSX_HEADERS = ("Ref", "Name", "Description", "Qty", "Category",
+                 "Unit Price", "Total", "Package", "Supplier", "Notes")
+_XLSX_COLUMN_WIDTHS = (8, 25, 40, 6, 15, 12, 12, 10, 15, 30)
+_XLSX_DATA_STYLES = ("bom_data",) * 5 + ("bom_currency",) * 2 + ("bom_data",) * 3
+_CURRENCY_FORMAT = '$#,##0.00'
+
+# Markdown component row (bound format: ref, name, description, qty, unit, total, supplier)
+_MD_ROW = "| {} | {} | {} | {} | ${:.2f} | ${:.2f} | {} |".format
+
+
+@dataclass(slots=True)
 class BOMItem:
     """Single item in the BOM"""
     reference: str  # e.g., "U1", "R1"
@@ -327,9 +377,16 @@ class BOMItem:
     @property
     def total_price(self) -> float:
         return self.quantity * self.unit_price_usd
+    
+    def __post_init__(self):
+        # Categories and suppliers repeat across items and key the summaries
+        if isinstance(self.category, str):
+            self.category = sys.intern(self.category)
+        if isinstance(self.supplier, str):
+            self.supplier = sys.intern(self.supplier)
 
 
-@dataclass
+@dataclass(slots=True)
 class BOM:
     """Complete Bill of Materials"""
     project_name: str = "Untitled Project"
@@ -340,44 +397,30 @@ class BOM:
     
     @property
     def total_cost(self) -> float:
-        return sum(item.total_price for item in self.items)
+        return fsum([item.total_price for item in self.items])
     
     @property
     def item_count(self) -> int:
-        return sum(item.quantity for item in self.items)
+        return sum([item.quantity for item in self.items])
     
     def add_from_database(self, name: str, quantity: int = 1, 
                           reference: str = "", notes: str = "",
                           supplier: str = "") -> bool:
         """Add an item from the component database"""
-        if name not in COMPONENT_DATABASE:
+        fields = _DB_ITEM_FIELDS.get(name)
+        if fields is None:
             return False
-        
-        comp = COMPONENT_DATABASE[name]
+        description, category, unit_price, package, suppliers = fields
         
         # Select supplier
-        suppliers = comp.get("suppliers", {})
-        if supplier and supplier in suppliers:
-            selected_supplier = supplier
-            supplier_link = suppliers[supplier]
-        elif suppliers:
-            selected_supplier = list(suppliers.keys())[0]
-            supplier_link = suppliers[selected_supplier]
+        if supplier in suppliers:
+            selected_supplier, supplier_link = supplier, suppliers[supplier]
         else:
-            selected_supplier = ""
-            supplier_link = ""
+            selected_supplier, supplier_link = _FIRST_SUPPLIER[name]
         
         item = BOMItem(
-            reference=reference or f"X{len(self.items)+1}",
-            name=name,
-            description=comp["description"],
-            quantity=quantity,
-            category=comp["category"],
-            unit_price_usd=comp["unit_price_usd"],
-            package=comp.get("package", ""),
-            supplier=selected_supplier,
-            supplier_link=supplier_link,
-            notes=notes
+            reference or f"X{len(self.items)+1}", name, description, quantity,
+            category, unit_price, package, selected_supplier, supplier_link, notes
         )
         
         self.items.append(item)
@@ -387,7 +430,7 @@ class BOM:
                    category: str, unit_price: float, **kwargs) -> None:
         """Add a custom item not in the database"""
         item = BOMItem(
-            reference=kwargs.get("reference", f"X{len(self.items)+1}"),
+            reference=kwargs["reference"] if "reference" in kwargs else f"X{len(self.items)+1}",
             name=name,
             description=description,
             quantity=quantity,
@@ -400,41 +443,39 @@ class BOM:
         )
         self.items.append(item)
     
+    def _category_summary(self) -> tuple:
+        """Per-category (quantity, cost) totals as two dicts keyed by category"""
+        counts = defaultdict(int)
+        costs = defaultdict(float)
+        for item in self.items:
+            counts[item.category] += item.quantity
+            costs[item.category] += item.total_price
+        return counts, costs
+    
     def to_csv(self, filename: str) -> None:
         """Export to CSV format"""
         with open(filename, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f)
-            
-            # Header
-            writer.writerow([
+            # Header, items and total row go out in a single writerows call
+            rows = [(
                 "Reference", "Name", "Description", "Quantity", 
                 "Category", "Unit Price ($)", "Total ($)", 
                 "Package", "Supplier", "Supplier Link", "Notes"
-            ])
-            
-            # Items
-            for item in self.items:
-                writer.writerow([
-                    item.reference, item.name, item.description, item.quantity,
-                    item.category, f"{item.unit_price_usd:.2f}", f"{item.total_price:.2f}",
-                    item.package, item.supplier, item.supplier_link, item.notes
-                ])
-            
-            # Total row
-            writer.writerow([])
-            writer.writerow(["", "", "", self.item_count, "", "", f"{self.total_cost:.2f}", "", "", "", ""])
-    
-    def to_xlsx(self, filename: str) -> bool:
-        """Export to Excel xlsx format with formatting"""
-        if not OPENPYXL_AVAILABLE:
-            print("Error: openpyxl not installed", file=sys.stderr)
-            return False
-        
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "BOM"
+            )]
+            rows.extend(
+                (item.reference, item.name, item.description, item.quantity,
+                 item.category, f"{item.unit_price_usd:.2f}", f"{item.total_price:.2f}",
+                 item.package, item.supplier, item.supplier_link, item.notes)
+                for item in self.items
+            )
+            rows.append(())
+            rows.append(("", "", "", self.item_count, "", "", f"{self.total_cost:.2f}", "", "", "", ""))
+            csv.writer(f).writerows(rows)
+    
+    def _add_xlsx_styles(self, wb) -> None:
+        """Register the named cell styles shared by both xlsx writers"""
+        from openpyxl.styles import Alignment, Border, Font, NamedStyle, PatternFill, Side
+        from openpyxl.styles.fonts import DEFAULT_FONT
         
-        # Styles
         header_font = Font(bold=True, color="FFFFFF")
         header_fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
         border = Border(
@@ -443,7 +484,37 @@ class BOM:
             top=Side(style='thin'),
             bottom=Side(style='thin')
         )
-        currency_format = '$#,##0.00'
+        
+        # Registered once on the workbook so cells take a style by name
+        wb.add_named_style(NamedStyle(name="bom_header", font=header_font, fill=header_fill,
+                                      border=border, alignment=Alignment(horizontal='center')))
+        wb.add_named_style(NamedStyle(name="bom_data", font=DEFAULT_FONT, border=border))
+        wb.add_named_style(NamedStyle(name="bom_currency", font=DEFAULT_FONT, border=border,
+                                      number_format=_CURRENCY_FORMAT))
+    
+    def to_xlsx(self, filename: str, streaming: Optional[bool] = None) -> bool:
+        """Export to Excel xlsx format with formatting
+        
+        Large BOMs (or streaming=True) go through to_xlsx_streaming.
+        """
+        if not OPENPYXL_AVAILABLE:
+            print("Error: openpyxl not installed", file=sys.stderr)
+            return False
+        
+        if streaming is None:
+            streaming = len(self.items) > XLSX_STREAMING_THRESHOLD
+        if streaming:
+            return self.to_xlsx_streaming(filename)
+        
+        from openpyxl import Workbook
+        from openpyxl.styles import Font
+        from openpyxl.utils import get_column_letter
+        
+        wb = Workbook()
+        ws = wb.active
+        ws.title = "BOM"
+        self._add_xlsx_styles(wb)
+        currency_format = _CURRENCY_FORMAT
         
         # Project info
         ws['A1'] = "Project:"
@@ -461,32 +532,28 @@ class BOM:
         ws['A4'].font = Font(bold=True)
         
         # Header row
-        headers = ["Ref", "Name", "Description", "Qty", "Category", 
-                   "Unit Price", "Total", "Package", "Supplier", "Notes"]
+        headers = _XLSX_HEADERS
         header_row = 6
         
         for col, header in enumerate(headers, 1):
-            cell = ws.cell(row=header_row, column=col, value=header)
-            cell.font = header_font
-            cell.fill = header_fill
-            cell.border = border
-            cell.alignment = Alignment(horizontal='center')
+            ws.cell(row=header_row, column=col, value=header).style = "bom_header"
         
-        # Data rows
-        for row_num, item in enumerate(self.items, header_row + 1):
-            data = [
+        # Data rows (appended whole, then styled in one pass)
+        for item in self.items:
+            ws.append((
                 item.reference, item.name, item.description, item.quantity,
                 item.category, item.unit_price_usd, item.total_price,
                 item.package, item.supplier, item.notes
-            ]
+            ))
+        
+        for row in ws.iter_rows(min_row=header_row + 1, max_row=header_row + len(self.items),
+                                max_col=len(headers)):
+            for cell in row:
+                cell.style = "bom_data"
             
-            for col, value in enumerate(data, 1):
-                cell = ws.cell(row=row_num, column=col, value=value)
-                cell.border = border
-                
-                # Format currency columns
-                if col in [6, 7]:
-                    cell.number_format = currency_format
+            # Format currency columns
+            row[5].style = "bom_currency"
+            row[6].style = "bom_currency"
         
         # Total row
         total_row = header_row + len(self.items) + 2
@@ -503,8 +570,7 @@ class BOM:
                 value=f"=SUM(G{formula_row}:G{end_row})")
         
         # Adjust column widths
-        column_widths = [8, 25, 40, 6, 15, 12, 12, 10, 15, 30]
-        for i, width in enumerate(column_widths, 1):
+        for i, width in enumerate(_XLSX_COLUMN_WIDTHS, 1):
             ws.column_dimensions[get_column_letter(i)].width = width
         
         # Category summary sheet
@@ -516,26 +582,87 @@ class BOM:
         ws2['B1'].font = Font(bold=True)
         ws2['C1'].font = Font(bold=True)
         
-        categories = {}
-        for item in self.items:
-            if item.category not in categories:
-                categories[item.category] = {"count": 0, "cost": 0}
-            categories[item.category]["count"] += item.quantity
-            categories[item.category]["cost"] += item.total_price
-        
-        for row, (cat, data) in enumerate(sorted(categories.items()), 2):
+        counts, costs = self._category_summary()
+        for row, cat in enumerate(sorted(counts), 2):
             ws2.cell(row=row, column=1, value=cat)
-            ws2.cell(row=row, column=2, value=data["count"])
-            cost_cell = ws2.cell(row=row, column=3, value=data["cost"])
+            ws2.cell(row=row, column=2, value=counts[cat])
+            cost_cell = ws2.cell(row=row, column=3, value=costs[cat])
             cost_cell.number_format = currency_format
         
         # Save
         wb.save(filename)
         return True
     
+    def to_xlsx_streaming(self, filename: str) -> bool:
+        """Export the same xlsx layout through a write-only workbook
+        
+        Rows are serialized as they are appended, so memory stays flat
+        regardless of BOM size.
+        """
+        if not OPENPYXL_AVAILABLE:
+            print("Error: openpyxl not installed", file=sys.stderr)
+            return False
+        
+        from openpyxl import Workbook
+        from openpyxl.cell import WriteOnlyCell
+        from openpyxl.styles import Font
+        from openpyxl.utils import get_column_letter
+        
+        wb = Workbook(write_only=True)
+        self._add_xlsx_styles(wb)
+        ws = wb.create_sheet(title="BOM")
+        bold = Font(bold=True)
+        
+        def cell(sheet, value, **attrs):
+            c = WriteOnlyCell(sheet, value=value)
+            for name, attr in attrs.items():
+                setattr(c, name, attr)
+            return c
+        
+        # Column widths must be set before the first row is written
+        for i, width in enumerate(_XLSX_COLUMN_WIDTHS, 1):
+            ws.column_dimensions[get_column_letter(i)].width = width
+        
+        # Project info, blank row, header row (row 6)
+        for label, value in (("Project:", self.project_name), ("Version:", self.version),
+                             ("Author:", self.author), ("Date:", self.date)):
+            ws.append((cell(ws, label, font=bold), value))
+        ws.append(())
+        ws.append([cell(ws, header, style="bom_header") for header in _XLSX_HEADERS])
+        
+        # Data rows
+        for item in self.items:
+            values = (
+                item.reference, item.name, item.description, item.quantity,
+                item.category, item.unit_price_usd, item.total_price,
+                item.package, item.supplier, item.notes
+            )
+            ws.append([cell(ws, value, style=style)
+                       for value, style in zip(values, _XLSX_DATA_STYLES)])
+        
+        # Blank row, then totals with a live SUM formula
+        first_row = 7
+        end_row = 6 + len(self.items)
+        ws.append(())
+        ws.append((
+            None, None, cell(ws, "TOTAL:", font=bold), cell(ws, self.item_count, font=bold),
+            None, None, cell(ws, f"=SUM(G{first_row}:G{end_row})", font=bold,
+                             number_format=_CURRENCY_FORMAT)
+        ))
+        
+        # Category summary sheet
+        ws2 = wb.create_sheet(title="By Category")
+        ws2.append([cell(ws2, title, font=bold) for title in ("Category", "Items", "Total Cost")])
+        counts, costs = self._category_summary()
+        for cat in sorted(counts):
+            ws2.append((cat, counts[cat], cell(ws2, costs[cat], number_format=_CURRENCY_FORMAT)))
+        
+        wb.save(filename)
+        return True
+    
     def to_markdown(self) -> str:
         """Generate markdown BOM table"""
-        lines = [
+        header = (
             f"# Bill of Materials: {self.project_name}",
             "",
             f"**Version:** {self.version}",
@@ -546,35 +673,31 @@ class BOM:
             "",
             "| Ref | Component | Description | Qty | Unit $ | Total $ | Supplier |",
             "|-----|-----------|-------------|-----|--------|---------|----------|"
-        ]
+        )
         
-        for item in self.items:
-            supplier_cell = f"[{item.supplier}]({item.supplier_link})" if item.supplier_link else item.supplier
-            lines.append(
-                f"| {item.reference} | {item.name} | {item.description} | "
-                f"{item.quantity} | ${item.unit_price_usd:.2f} | ${item.total_price:.2f} | {supplier_cell} |"
-            )
+        row = _MD_ROW
+        item_lines = [
+            row(item.reference, item.name, item.description, item.quantity,
+                item.unit_price_usd, item.total_price,
+                f"[{item.supplier}]({item.supplier_link})" if item.supplier_link else item.supplier)
+            for item in self.items
+        ]
         
-        lines.extend([
+        tail = (
             "",
             f"**Total Components:** {self.item_count}",
             f"**Estimated Cost:** ${self.total_cost:.2f}",
             "",
             "## By Category",
             ""
-        ])
-        
-        categories = {}
-        for item in self.items:
-            if item.category not in categories:
-                categories[item.category] = {"count": 0, "cost": 0}
-            categories[item.category]["count"] += item.quantity
-            categories[item.category]["cost"] += item.total_price
+        )
         
-        for cat, data in sorted(categories.items()):
-            lines.append(f"- **{cat}:** {data['count']} items, ${data['cost']:.2f}")
+        counts, costs = self._category_summary()
+        category_lines = (
+            f"- **{cat}:** {counts[cat]} items, ${costs[cat]:.2f}" for cat in sorted(counts)
+        )
         
-        return "\n".join(lines)
+        return "\n".join(chain(header, item_lines, tail, category_lines))
     
     def to_dict(self) -> dict:
         """Export to dictionary/JSON"""
@@ -605,10 +728,16 @@ class BOM:
             }
         }
     
+    def to_json_bytes(self) -> bytes:
+        """Export to indented UTF-8 JSON, serialized by orjson when installed"""
+        if orjson is not None:
+            return orjson.dumps(self.to_dict(), option=orjson.OPT_INDENT_2)
+        return json.dumps(self.to_dict(), indent=2, ensure_ascii=False).encode("utf-8")
+    
     @classmethod
     def from_json(cls, filepath: str) -> 'BOM':
         """Load BOM from JSON file"""
-        with open(filepath, 'r') as f:
+        with open(filepath, 'r', encoding='utf-8') as f:
             data = json.load(f)
         
         bom = cls(
@@ -618,17 +747,21 @@ class BOM:
             date=data.get("date", datetime.now().strftime("%Y-%m-%d"))
         )
         
-        for item in data.get("items", []):
-            if item.get("name") in COMPONENT_DATABASE:
-                bom.add_from_database(
-                    name=item["name"],
+        db = COMPONENT_DATABASE
+        add_db = bom.add_from_database
+        add_custom = bom.add_custom
+        for item in data.get("items") or ():
+            name = item.get("name")
+            if name in db:
+                add_db(
+                    name=name,
                     quantity=item.get("quantity", 1),
                     reference=item.get("reference", ""),
                     notes=item.get("notes", ""),
                     supplier=item.get("supplier", "")
                 )
             else:
-                bom.add_custom(
+                add_custom(
                     name=item.get("name", "Unknown"),
                     description=item.get("description", ""),
                     quantity=item.get("quantity", 1),
@@ -643,6 +776,13 @@ class BOM:
         return bom
 
 
+# Export menu choices that select each format ("5" = all)
+_XLSX_CHOICES = frozenset(("1", "5"))
+_CSV_CHOICES = frozenset(("2", "5"))
+_MD_CHOICES = frozenset(("3", "5"))
+_JSON_CHOICES = frozenset(("4", "5"))
+
+
 def interactive_mode():
     """Run BOM generator in interactive mode"""
     print("=" * 60)
@@ -657,8 +797,7 @@ def interactive_mode():
     bom = BOM(project_name=project_name, version=version, author=author)
     
     print("\nAvailable components in database:")
-    for i, name in enumerate(COMPONENT_DATABASE.keys(), 1):
-        print(f"  {i:2}. {name}")
+    print(_DB_MENU)
     
     print("\nEnter components (empty line to finish):")
     print("Format: <name or number> [quantity] [reference]")
@@ -668,7 +807,8 @@ def interactive_mode():
         if not line:
             break
         
-        parts = line.split()
+        # <name> [quantity] [reference]; anything after the reference is ignored
+        parts = line.split(maxsplit=3)
         comp_input = parts[0]
         quantity = int(parts[1]) if len(parts) > 1 else 1
         reference = parts[2] if len(parts) > 2 else ""
@@ -676,9 +816,8 @@ def interactive_mode():
         # Handle numeric input
         if comp_input.isdigit():
             idx = int(comp_input) - 1
-            names = list(COMPONENT_DATABASE.keys())
-            if 0 <= idx < len(names):
-                comp_input = names[idx]
+            if 0 <= idx < len(_DB_NAMES):
+                comp_input = _DB_NAMES[idx]
             else:
                 print("Invalid number")
                 continue
@@ -710,22 +849,22 @@ def interactive_mode():
     choice = input("\nExport format [1]: ").strip() or "1"
     base_name = project_name.replace(" ", "_")
     
-    if choice in ["1", "5"]:
+    if choice in _XLSX_CHOICES:
         if bom.to_xlsx(f"{base_name}_BOM.xlsx"):
             print(f"Saved: {base_name}_BOM.xlsx")
     
-    if choice in ["2", "5"]:
+    if choice in _CSV_CHOICES:
         bom.to_csv(f"{base_name}_BOM.csv")
         print(f"Saved: {base_name}_BOM.csv")
     
-    if choice in ["3", "5"]:
+    if choice in _MD_CHOICES:
         with open(f"{base_name}_BOM.md", 'w') as f:
             f.write(bom.to_markdown())
         print(f"Saved: {base_name}_BOM.md")
     
-    if choice in ["4", "5"]:
-        with open(f"{base_name}_BOM.json", 'w') as f:
-            json.dump(bom.to_dict(), f, indent=2)
+    if choice in _JSON_CHOICES:
+        with open(f"{base_name}_BOM.json", 'wb') as f:
+            f.write(bom.to_json_bytes())
         print(f"Saved: {base_name}_BOM.json")
 
 
@@ -741,10 +880,7 @@ def main():
     args = parser.parse_args()
     
     if args.list:
-        print("Component Database:")
-        print("-" * 80)
-        for name, data in COMPONENT_DATABASE.items():
-            print(f"{name:25} ${data['unit_price_usd']:6.2f}  {data['description']}")
+        sys.stdout.write(_LIST_TABLE)
         return
     
     if args.interactive:
@@ -763,8 +899,8 @@ def main():
             with open(output, 'w') as f:
                 f.write(bom.to_markdown())
         elif args.format == "json":
-            with open(output, 'w') as f:
-                json.dump(bom.to_dict(), f, indent=2)
+            with open(output, 'wb') as f:
+                f.write(bom.to_json_bytes())
         
         print(f"Generated: {output}")
         return
@@ -19,12 +19,20 @@ Usage:
 """
 
 import argparse
-from typing import List, Optional
+import io
+import re
+from functools import lru_cache
+from pathlib import Path
+from string import Template
+from typing import List, Optional, Tuple
 
 # =============================================================================
 # Sketch Templates
 # =============================================================================
 
+# Parameterized sketches are string.Template objects: ${name} placeholders,
+# C braces written as-is.
+
 I2C_SCANNER = '''/*
  * I2C Bus Scanner
  * Scans for all connected I2C devices and reports addresses
@@ -51,6 +59,14 @@ void setup() {
     
     Wire.begin();
     
+    // Bound each address probe so a stuck or unanswered bus cannot stall
+    // the scan (UNO R4 cores without a timeout block ~1 s per address)
+#if defined(WIRE_HAS_TIMEOUT)
+    Wire.setWireTimeout(3000, true);  // 3 ms, reset the bus on timeout
+#elif defined(ARDUINO_ARCH_ESP32)
+    Wire.setTimeOut(10);              // ms
+#endif
+    
     Serial.println();
     Serial.println("========================================");
     Serial.println("         I2C Bus Scanner v1.0          ");
@@ -67,92 +83,131 @@ void loop() {
     scanI2C();
 }
 
+// Whole-scan deadline: addresses not probed in time are shown as "??"
+const unsigned long SCAN_BUDGET_MS = 2000;
+
 void scanI2C() {
+    // Addresses that ACK are recorded so the details pass needs no re-probe
+    byte found[0x77 - 0x03 + 1];
     byte deviceCount = 0;
     byte error;
+    bool budgetExceeded = false;
+    unsigned long scanStart = millis();
     
     Serial.println("Scanning I2C bus (0x03 to 0x77)...");
     Serial.println();
     
     // Print header
-    Serial.print("     ");
-    for (byte i = 0; i < 16; i++) {
-        Serial.print(" ");
-        if (i < 16) Serial.print(i, HEX);
-    }
-    Serial.println();
+    Serial.println("      0 1 2 3 4 5 6 7 8 9 A B C D E F");
+    
+    // Each row is formatted into one buffer and written once
+    char line[56];
     
     for (byte row = 0; row < 8; row++) {
-        Serial.print(row, HEX);
-        Serial.print("0: ");
+        int n = snprintf(line, sizeof(line), "%X0: ", row);
         
         for (byte col = 0; col < 16; col++) {
             byte addr = (row << 4) | col;
             
             if (addr < 0x03 || addr > 0x77) {
-                Serial.print(" --");
+                n += snprintf(line + n, sizeof(line) - n, " --");
+            } else if (budgetExceeded || millis() - scanStart > SCAN_BUDGET_MS) {
+                budgetExceeded = true;
+                n += snprintf(line + n, sizeof(line) - n, " ??");
             } else {
                 Wire.beginTransmission(addr);
                 error = Wire.endTransmission();
                 
                 if (error == 0) {
-                    Serial.print(" ");
-                    if (addr < 16) Serial.print("0");
-                    Serial.print(addr, HEX);
-                    deviceCount++;
+                    n += snprintf(line + n, sizeof(line) - n, " %02X", addr);
+                    found[deviceCount++] = addr;
                 } else {
-                    Serial.print(" --");
+                    n += snprintf(line + n, sizeof(line) - n, " --");
                 }
             }
         }
-        Serial.println();
+        n += snprintf(line + n, sizeof(line) - n, "\\r\\n");
+        Serial.write((const uint8_t*)line, n);
     }
     
     Serial.println();
+    if (budgetExceeded) {
+        Serial.println("Scan stopped early: bus too slow or stuck (check SDA/SCL pull-ups)");
+    }
+#if defined(WIRE_HAS_TIMEOUT)
+    if (Wire.getWireTimeoutFlag()) {
+        Serial.println("Warning: I2C timeouts occurred (bus was reset)");
+        Wire.clearWireTimeoutFlag();
+    }
+#endif
     Serial.print("Found ");
     Serial.print(deviceCount);
     Serial.println(" device(s)");
     
     if (deviceCount > 0) {
         Serial.println("\\nDevice details:");
-        for (byte addr = 0x03; addr <= 0x77; addr++) {
-            Wire.beginTransmission(addr);
-            if (Wire.endTransmission() == 0) {
-                Serial.print("  0x");
-                if (addr < 16) Serial.print("0");
-                Serial.print(addr, HEX);
-                Serial.print(" - ");
-                Serial.println(identifyDevice(addr));
-            }
+        for (byte i = 0; i < deviceCount; i++) {
+            byte addr = found[i];
+            Serial.print("  0x");
+            if (addr < 16) Serial.print("0");
+            Serial.print(addr, HEX);
+            Serial.print(" - ");
+            Serial.println(identifyDevice(addr));
         }
     }
 }
 
-String identifyDevice(byte addr) {
+// Known devices: names and the address table live in flash (PROGMEM),
+// so lookups allocate nothing
+const char N_LCD[] PROGMEM = "LCD I2C (PCF8574)";
+const char N_OLED[] PROGMEM = "OLED SSD1306";
+const char N_RTC_MPU[] PROGMEM = "DS3231 RTC or MPU6050";
+const char N_MPU_ALT[] PROGMEM = "MPU6050 (ALT)";
+const char N_BME[] PROGMEM = "BME280/BMP280";
+const char N_ADS[] PROGMEM = "ADS1115/PCF8591";
+const char N_EEPROM_LC[] PROGMEM = "EEPROM 24LC256";
+const char N_MAX30102[] PROGMEM = "MAX30102 Pulse Sensor";
+const char N_HMC[] PROGMEM = "HMC5883L Compass";
+const char N_ADXL[] PROGMEM = "ADXL345 Accelerometer";
+const char N_INA[] PROGMEM = "INA219 Current Sensor or HTU21D";
+const char N_SHT[] PROGMEM = "SHT31 Humidity";
+const char N_VL53[] PROGMEM = "VL53L0X ToF Sensor";
+
+struct DeviceName {
+    uint8_t addr;
+    PGM_P name;
+};
+
+const DeviceName DEV_TABLE[] PROGMEM = {
+    {0x27, N_LCD}, {0x3F, N_LCD},
+    {0x3C, N_OLED}, {0x3D, N_OLED},
+    {0x68, N_RTC_MPU},
+    {0x69, N_MPU_ALT},
+    {0x76, N_BME}, {0x77, N_BME},
+    {0x48, N_ADS},
+    {0x50, N_EEPROM_LC},
+    {0x57, N_MAX30102},
+    {0x1E, N_HMC},
+    {0x53, N_ADXL},
+    {0x40, N_INA},
+    {0x44, N_SHT},
+    {0x29, N_VL53},
+};
+
+const __FlashStringHelper* identifyDevice(byte addr) {
     // Common device identification
-    switch(addr) {
-        case 0x27: case 0x3F: return "LCD I2C (PCF8574)";
-        case 0x3C: case 0x3D: return "OLED SSD1306";
-        case 0x68: return "DS3231 RTC or MPU6050";
-        case 0x69: return "MPU6050 (ALT)";
-        case 0x76: case 0x77: return "BME280/BMP280";
-        case 0x48: return "ADS1115/PCF8591";
-        case 0x50: return "EEPROM 24LC256";
-        case 0x57: return "MAX30102 Pulse Sensor";
-        case 0x1E: return "HMC5883L Compass";
-        case 0x53: return "ADXL345 Accelerometer";
-        case 0x40: return "INA219 Current Sensor or HTU21D";
-        case 0x44: return "SHT31 Humidity";
-        case 0x29: return "VL53L0X ToF Sensor";
-        default:
-            if (addr >= 0x20 && addr <= 0x27) return "PCF8574 I/O Expander";
-            if (addr >= 0x50 && addr <= 0x57) return "EEPROM";
-            return "Unknown device";
+    for (byte i = 0; i < sizeof(DEV_TABLE) / sizeof(DEV_TABLE[0]); i++) {
+        if (pgm_read_byte(&DEV_TABLE[i].addr) == addr) {
+            return (const __FlashStringHelper*)pgm_read_ptr(&DEV_TABLE[i].name);
+        }
     }
+    if (addr >= 0x20 && addr <= 0x27) return F("PCF8574 I/O Expander");
+    if (addr >= 0x50 && addr <= 0x57) return F("EEPROM");
+    return F("Unknown device");
 }
 '''
 
-GPIO_TESTER = '''/*
+GPIO_TESTER = Template('''/*
  * GPIO Pin Tester
  * Tests digital I/O functionality
  * 
@@ -161,13 +216,13 @@ GPIO_TESTER = '''/*
  * - Input test with pullup
  * - Measures pin capacitance indication
  * 
- * Test pins: {pins}
+ * Test pins: ${pins}
  */
 
-const int TEST_PINS[] = {{{pins_array}}};
-const int NUM_PINS = {num_pins};
+const int TEST_PINS[] = {${pins_array}};
+const int NUM_PINS = ${num_pins};
 
-void setup() {{
+void setup() {
     Serial.begin(115200);
     while (!Serial) delay(10);
     
@@ -177,49 +232,49 @@ void setup() {{
     Serial.println("========================================");
     Serial.println();
     
-    Serial.println("Testing pins: {pins}");
+    Serial.println("Testing pins: ${pins}");
     Serial.println();
     
     // Test each pin
-    for (int i = 0; i < NUM_PINS; i++) {{
+    for (int i = 0; i < NUM_PINS; i++) {
         testPin(TEST_PINS[i]);
-    }}
+    }
     
     Serial.println("\\nOutput test - watch for LED blink pattern...");
     outputTest();
-}}
+}
 
-void loop() {{
+void loop() {
     // Continuous input monitoring
     Serial.println("\\nMonitoring inputs (press any key to restart)...");
     
-    while (!Serial.available()) {{
-        for (int i = 0; i < NUM_PINS; i++) {{
+    while (!Serial.available()) {
+        for (int i = 0; i < NUM_PINS; i++) {
             pinMode(TEST_PINS[i], INPUT_PULLUP);
-        }}
+        }
         
         Serial.print("Inputs: ");
-        for (int i = 0; i < NUM_PINS; i++) {{
+        for (int i = 0; i < NUM_PINS; i++) {
             Serial.print("D");
             Serial.print(TEST_PINS[i]);
             Serial.print("=");
             Serial.print(digitalRead(TEST_PINS[i]));
             Serial.print(" ");
-        }}
+        }
         Serial.println();
         delay(500);
-    }}
+    }
     
     while (Serial.available()) Serial.read();
     
     Serial.println("\\n--- Restarting test ---\\n");
-    for (int i = 0; i < NUM_PINS; i++) {{
+    for (int i = 0; i < NUM_PINS; i++) {
         testPin(TEST_PINS[i]);
-    }}
+    }
     outputTest();
-}}
+}
 
-void testPin(int pin) {{
+void testPin(int pin) {
     Serial.print("Pin D");
     Serial.print(pin);
     Serial.print(": ");
@@ -246,65 +301,83 @@ void testPin(int pin) {{
     Serial.print(floatVal);
     
     // Diagnosis
-    if (pullupVal == HIGH && floatVal == LOW) {{
+    if (pullupVal == HIGH && floatVal == LOW) {
         Serial.println(" [OK - normal]");
-    }} else if (pullupVal == HIGH && floatVal == HIGH) {{
+    } else if (pullupVal == HIGH && floatVal == HIGH) {
         Serial.println(" [OK - pulled high externally]");
-    }} else if (pullupVal == LOW) {{
+    } else if (pullupVal == LOW) {
         Serial.println(" [WARNING - pulled low or shorted to GND]");
-    }} else {{
+    } else {
         Serial.println(" [OK]");
-    }}
-}}
+    }
+}
 
-void outputTest() {{
+void outputTest() {
     // Set all as outputs
-    for (int i = 0; i < NUM_PINS; i++) {{
+    for (int i = 0; i < NUM_PINS; i++) {
         pinMode(TEST_PINS[i], OUTPUT);
-    }}
+    }
     
     // Blink pattern
-    for (int cycle = 0; cycle < 5; cycle++) {{
+    for (int cycle = 0; cycle < 5; cycle++) {
         // All on
-        for (int i = 0; i < NUM_PINS; i++) {{
+        for (int i = 0; i < NUM_PINS; i++) {
             digitalWrite(TEST_PINS[i], HIGH);
-        }}
+        }
         delay(200);
         
         // All off
-        for (int i = 0; i < NUM_PINS; i++) {{
+        for (int i = 0; i < NUM_PINS; i++) {
             digitalWrite(TEST_PINS[i], LOW);
-        }}
+        }
         delay(200);
-    }}
+    }
     
     // Sequential chase
-    for (int cycle = 0; cycle < 3; cycle++) {{
-        for (int i = 0; i < NUM_PINS; i++) {{
+    for (int cycle = 0; cycle < 3; cycle++) {
+        for (int i = 0; i < NUM_PINS; i++) {
             digitalWrite(TEST_PINS[i], HIGH);
             delay(100);
             digitalWrite(TEST_PINS[i], LOW);
-        }}
-    }}
+        }
+    }
     
     Serial.println("Output test complete");
-}}
-'''
+}
+''')
 
-ADC_CHECKER = '''/*
+ADC_CHECKER = Template('''/*
  * ADC / Analog Input Checker
  * Reads and displays analog values with voltage calculation
  * 
- * Test pins: {pins}
- * Reference: {vref}V (10-bit = 0-1023)
+ * Test pins: ${pins}
+ * Reference: ${vref}V (10-bit = 0-1023)
  */
 
-const int ADC_PINS[] = {{{pins_array}}};
-const int NUM_PINS = {num_pins};
-const float VREF = {vref};  // Reference voltage
+const int ADC_PINS[] = {${pins_array}};
+const int NUM_PINS = ${num_pins};
+const float VREF = ${vref};  // Reference voltage
 const int ADC_MAX = 1023;   // 10-bit ADC
 
-void setup() {{
+// Level bar halves, sliced by the line formatter
+const char ADC_BAR_FULL[] = "####################";
+const char ADC_BAR_EMPTY[] = "                    ";
+
+#if defined(ESP32) && defined(ESP_ARDUINO_VERSION_MAJOR) && ESP_ARDUINO_VERSION_MAJOR >= 3
+// Continuous (DMA) sampling: the ADC fills frames of SAMPLES_PER_PIN
+// conversions per channel in the background, loop() only reads averages
+#define ADC_CONTINUOUS
+const uint32_t SAMPLES_PER_PIN = 16;
+const uint32_t SAMPLE_RATE_HZ = 20000;
+volatile bool adcFrameReady = false;
+bool adcContinuous = false;  // Set once the continuous driver is running
+
+void ARDUINO_ISR_ATTR onAdcFrame() {
+    adcFrameReady = true;
+}
+#endif
+
+void setup() {
     Serial.begin(115200);
     while (!Serial) delay(10);
     
@@ -317,61 +390,77 @@ void setup() {{
     Serial.print("Reference voltage: ");
     Serial.print(VREF);
     Serial.println("V");
-    Serial.print("Testing pins: {pins}");
+    Serial.print("Testing pins: ${pins}");
     Serial.println();
     Serial.println();
     
+#ifdef ADC_CONTINUOUS
+    uint8_t pins[NUM_PINS];
+    for (int i = 0; i < NUM_PINS; i++) pins[i] = ADC_PINS[i];
+    // ADC2 pins (among others) can't run continuously: stay on analogRead
+    adcContinuous = analogContinuous(pins, NUM_PINS, SAMPLES_PER_PIN, SAMPLE_RATE_HZ, &onAdcFrame)
+                    && analogContinuousStart();
+    if (!adcContinuous) {
+        analogContinuousDeinit();  // Release the pins for analogRead
+        Serial.println("Continuous ADC unavailable for these pins, using analogRead");
+        Serial.println();
+    }
+#endif
+    
     // Print header
     printHeader();
-}}
+}
 
-void loop() {{
-    // Read and display all channels
-    for (int i = 0; i < NUM_PINS; i++) {{
+void loop() {
+    // Read and display all channels, one buffered write per line
+    char line[64];
+    
+#ifdef ADC_CONTINUOUS
+    adc_continuous_data_t* frame = NULL;
+    if (adcContinuous) {
+        if (!adcFrameReady) return;  // Conversion still running
+        adcFrameReady = false;
+        if (!analogContinuousRead(&frame, 0)) return;
+    }
+#endif
+    
+    for (int i = 0; i < NUM_PINS; i++) {
+#ifdef ADC_CONTINUOUS
+        // Frame averages are at full DMA width, scale down to ADC_MAX
+        int raw = frame ? frame[i].avg_read_raw >> (SOC_ADC_DIGI_MAX_BITWIDTH - 10)
+                        : analogRead(ADC_PINS[i]);
+#else
         int raw = analogRead(ADC_PINS[i]);
+#endif
         float voltage = (raw * VREF) / ADC_MAX;
         float percent = (raw * 100.0) / ADC_MAX;
         
-        // Pin label
-        Serial.print("A");
-        Serial.print(ADC_PINS[i] - A0);
-        Serial.print(": ");
-        
-        // Raw value (padded)
-        if (raw < 1000) Serial.print(" ");
-        if (raw < 100) Serial.print(" ");
-        if (raw < 10) Serial.print(" ");
-        Serial.print(raw);
-        
-        Serial.print(" | ");
+        // Fixed-point parts (AVR snprintf has no %f)
+        long mv = (long)(voltage * 1000 + 0.5);
+        long tenths = (long)(percent * 10 + 0.5);
         
-        // Voltage
-        Serial.print(voltage, 3);
-        Serial.print("V | ");
-        
-        // Percentage bar
+        // Percentage bar, sliced from the two constant halves
         int bars = percent / 5;  // 20 chars max
-        Serial.print("[");
-        for (int b = 0; b < 20; b++) {{
-            if (b < bars) Serial.print("#");
-            else Serial.print(" ");
-        }}
-        Serial.print("] ");
-        Serial.print(percent, 1);
-        Serial.println("%");
-    }}
+        if (bars > 20) bars = 20;  // 12-bit cores read past ADC_MAX
+        
+        int n = snprintf(line, sizeof(line), "A%d: %4d | %ld.%03ldV | [%.*s%.*s] %ld.%ld%%\\r\\n",
+                         ADC_PINS[i] - A0, raw, mv / 1000, mv % 1000,
+                         bars, ADC_BAR_FULL, 20 - bars, ADC_BAR_EMPTY,
+                         tenths / 10, tenths % 10);
+        Serial.write((const uint8_t*)line, n);
+    }
     
     Serial.println("----------------------------------------");
     delay(500);
-}}
+}
 
-void printHeader() {{
+void printHeader() {
     Serial.println("Pin  | Raw  | Voltage | Level");
     Serial.println("----------------------------------------");
-}}
-'''
+}
+''')
 
-PWM_TESTER = '''/*
+PWM_TESTER = Template('''/*
  * PWM Output Tester
  * Tests PWM output on specified pins with varying duty cycles
  * 
@@ -381,17 +470,49 @@ PWM_TESTER = '''/*
  *   ESP32: Any GPIO (LEDC)
  *   Pico: Any GPIO
  * 
- * Test pins: {pins}
+ * Test pins: ${pins}
  */
 
-const int PWM_PINS[] = {{{pins_array}}};
-const int NUM_PINS = {num_pins};
+const int PWM_PINS[] = {${pins_array}};
+const int NUM_PINS = ${num_pins};
 
 int currentDuty = 0;
 int direction = 1;
 bool fadeMode = true;
 
-void setup() {{
+// Duty bar halves, written as slices instead of one char at a time
+const char PWM_BAR_FULL[] = "=====================";
+const char PWM_BAR_EMPTY[] = "                     ";
+
+// Command line buffer: filled without blocking or heap allocation
+char cmdLine[8];
+byte cmdLen = 0;
+unsigned long cmdLastByte = 0;
+const unsigned long CMD_IDLE_MS = 1000;  // Ends a command sent with no line ending
+
+// Collects bytes until CR/LF or a pause; returns true once a non-empty line is ready
+bool readCommand() {
+    while (Serial.available()) {
+        char c = Serial.read();
+        cmdLastByte = millis();
+        if (c == '\\n' || c == '\\r') {
+            if (cmdLen == 0) continue;  // Empty line or second half of CRLF
+            cmdLine[cmdLen] = '\\0';
+            cmdLen = 0;
+            return true;
+        }
+        if (c != ' ' && cmdLen < sizeof(cmdLine) - 1) cmdLine[cmdLen++] = c;
+    }
+    // With "No line ending" no terminator ever comes: a pause ends the command
+    if (cmdLen > 0 && millis() - cmdLastByte >= CMD_IDLE_MS) {
+        cmdLine[cmdLen] = '\\0';
+        cmdLen = 0;
+        return true;
+    }
+    return false;
+}
+
+void setup() {
     Serial.begin(115200);
     while (!Serial) delay(10);
     
@@ -400,7 +521,7 @@ void setup() {{
     Serial.println("         PWM Output Tester v1.0        ");
     Serial.println("========================================");
     Serial.println();
-    Serial.println("Testing pins: {pins}");
+    Serial.println("Testing pins: ${pins}");
     Serial.println();
     Serial.println("Commands:");
     Serial.println("  0-255: Set specific duty cycle");
@@ -409,74 +530,69 @@ void setup() {{
     Serial.println();
     
     // Initialize pins
-    for (int i = 0; i < NUM_PINS; i++) {{
+    for (int i = 0; i < NUM_PINS; i++) {
         pinMode(PWM_PINS[i], OUTPUT);
-    }}
-}}
+    }
+}
 
-void loop() {{
+void loop() {
     // Check for serial commands
-    if (Serial.available()) {{
-        String cmd = Serial.readStringUntil('\\n');
-        cmd.trim();
-        
-        if (cmd == "f") {{
+    if (readCommand()) {
+        if (strcmp(cmdLine, "f") == 0) {
             fadeMode = !fadeMode;
             Serial.print("Fade mode: ");
             Serial.println(fadeMode ? "ON" : "OFF");
-        }} else if (cmd == "s") {{
-            for (int i = 0; i < NUM_PINS; i++) {{
+        } else if (strcmp(cmdLine, "s") == 0) {
+            for (int i = 0; i < NUM_PINS; i++) {
                 analogWrite(PWM_PINS[i], 0);
-            }}
+            }
             Serial.println("All PWM stopped");
             fadeMode = false;
-        }} else {{
-            int duty = cmd.toInt();
-            if (duty >= 0 && duty <= 255) {{
+        } else {
+            int duty = atoi(cmdLine);
+            if (duty >= 0 && duty <= 255) {
                 currentDuty = duty;
                 fadeMode = false;
-                for (int i = 0; i < NUM_PINS; i++) {{
+                for (int i = 0; i < NUM_PINS; i++) {
                     analogWrite(PWM_PINS[i], currentDuty);
-                }}
+                }
                 Serial.print("Set duty cycle: ");
                 Serial.print(currentDuty);
                 Serial.print(" (");
                 Serial.print((currentDuty * 100) / 255);
                 Serial.println("%)");
-            }}
-        }}
-    }}
+            }
+        }
+    }
     
     // Fade mode - smooth ramp up/down
-    if (fadeMode) {{
+    if (fadeMode) {
         currentDuty += direction * 5;
-        if (currentDuty >= 255) {{
+        if (currentDuty >= 255) {
             currentDuty = 255;
             direction = -1;
-        }} else if (currentDuty <= 0) {{
+        } else if (currentDuty <= 0) {
             currentDuty = 0;
             direction = 1;
-        }}
+        }
         
-        for (int i = 0; i < NUM_PINS; i++) {{
+        for (int i = 0; i < NUM_PINS; i++) {
             analogWrite(PWM_PINS[i], currentDuty);
-        }}
+        }
         
         // Display
         Serial.print("PWM: ");
         Serial.print(currentDuty);
         Serial.print(" [");
         int bars = currentDuty / 12;  // ~21 chars
-        for (int b = 0; b < 21; b++) {{
-            if (b < bars) Serial.print("=");
-            else Serial.print(" ");
-        }}
+        Serial.write((const uint8_t*)PWM_BAR_FULL, bars);
+        Serial.write((const uint8_t*)PWM_BAR_EMPTY, 21 - bars);
         Serial.println("]");
         
         delay(30);
-    }}
-}}
-'''
+    }
+}
+''')
 
 SERIAL_LOOPBACK = '''/*
  * Serial Loopback Tester
@@ -590,19 +706,16 @@ void loopbackTest() {
 void sendTestString() {
     Serial.println("\\n--- Sending Test Pattern ---");
     
-    // ASCII printable range
+    // ASCII printable range, built in RAM and sent as one write
     Serial.println("ASCII printable characters:");
-    for (char c = 32; c < 127; c++) {
-        Serial.print(c);
-    }
+    char ascii[127 - 32];
+    for (byte i = 0; i < sizeof(ascii); i++) ascii[i] = 32 + i;
+    Serial.write((const uint8_t*)ascii, sizeof(ascii));
     Serial.println();
     
     // Numbers
     Serial.println("\\nNumber sequence:");
-    for (int i = 0; i < 10; i++) {
-        Serial.print(i);
-    }
-    Serial.println();
+    Serial.println("0123456789");
     
     Serial.println("\\nTest complete");
 }
@@ -615,25 +728,35 @@ void monitorMode() {
     int byteCount = 0;
     unsigned long lastPrint = 0;
     
+    // Echoed bytes are staged here and flushed in chunks
+    char out[64];
+    byte oi = 0;
+    
     while (true) {
         // Check for exit (data from USB serial)
         // This is tricky in loopback mode...
         
         // Display any received data
         while (Serial.available()) {
-            char c = Serial.read();
+            uint8_t c = Serial.read();
             
             // Print as hex and ASCII
             if (c >= 32 && c < 127) {
-                Serial.print(c);
+                out[oi++] = c;
             } else {
-                Serial.print("[");
-                Serial.print((int)c, HEX);
-                Serial.print("]");
+                oi += snprintf(out + oi, sizeof(out) - oi, "[%X]", c);
+            }
+            if (oi > sizeof(out) - 5) {
+                Serial.write((const uint8_t*)out, oi);
+                oi = 0;
             }
             
             byteCount++;
         }
+        if (oi) {
+            Serial.write((const uint8_t*)out, oi);
+            oi = 0;
+        }
         
         // Stats every 2 seconds
         if (millis() - lastPrint > 2000) {
@@ -655,7 +778,7 @@ void monitorMode() {
 }
 '''
 
-VOLTAGE_DIVIDER = '''/*
+VOLTAGE_DIVIDER = Template('''/*
  * Voltage Divider Calculator & Tester
  * Calculates and tests voltage divider circuits
  * 
@@ -666,22 +789,52 @@ VOLTAGE_DIVIDER = '''/*
  * 
  * Formula: Vout = Vin * (R2 / (R1 + R2))
  * 
- * Connect Vout to: {adc_pin}
+ * Connect Vout to: ${adc_pin}
  */
 
-const int ADC_PIN = {adc_pin};
-const float VREF = {vref};        // ADC reference voltage
+const int ADC_PIN = ${adc_pin};
+const float VREF = ${vref};        // ADC reference voltage
 const int ADC_MAX = 1023;         // 10-bit ADC
 
 // Resistor values (ohms) - adjust to match your circuit
-float R1 = {r1};  // Top resistor (Vin side)
-float R2 = {r2};  // Bottom resistor (GND side)
+float R1 = ${r1};  // Top resistor (Vin side)
+float R2 = ${r2};  // Bottom resistor (GND side)
 
 // Calculated divider ratio
 float dividerRatio;
 
-void setup() {{
+// Running average: loop() drops one sample into a ring every SAMPLE_MS
+// and keeps the sum, so a reading is O(1) and never blocks
+const uint8_t AVG_N = 16;           // Power of two (index wraps with a mask)
+const unsigned long SAMPLE_MS = 10;
+uint16_t ring[AVG_N];
+uint8_t ringIdx = 0;
+uint32_t ringSum = 0;
+unsigned long lastSample = 0;
+
+void sampleAdc() {
+    if (millis() - lastSample < SAMPLE_MS) return;
+    lastSample = millis();
+    uint16_t s = analogRead(ADC_PIN);
+    ringSum += s;
+    ringSum -= ring[ringIdx];
+    ring[ringIdx] = s;
+    ringIdx = (ringIdx + 1) & (AVG_N - 1);
+}
+
+// Non-blocking resistor entry: '1'/'2' arm the parser and loop() feeds
+// it bytes as they arrive, so sampling keeps running while typing
+enum AdjState { IDLE, READING_R1, READING_R2 };
+AdjState adjState = IDLE;
+float adjValue = 0;
+float adjScale = 0;  // Weight of the next fraction digit, 0 before '.'
+bool adjDigits = false;
+unsigned long adjLastByte = 0;
+const unsigned long ADJ_IDLE_MS = 1000;  // Ends a number sent with no line ending
+
+void setup() {
     Serial.begin(115200);
+    Serial.setTimeout(100);  // Bound any Stream parse to 100 ms
     while (!Serial) delay(10);
     
     Serial.println();
@@ -690,6 +843,12 @@ void setup() {{
     Serial.println("========================================");
     Serial.println();
     
+    // Prime the running average so the first reading is already valid
+    for (uint8_t i = 0; i < AVG_N; i++) {
+        ring[i] = analogRead(ADC_PIN);
+        ringSum += ring[i];
+    }
+    
     // Calculate ratio
     dividerRatio = R2 / (R1 + R2);
     float maxVin = VREF / dividerRatio;
@@ -715,14 +874,25 @@ void setup() {{
     Serial.println("  c - Continuous reading");
     Serial.println("  1/2 - Adjust R1/R2 values");
     Serial.println();
-}}
+}
 
-void loop() {{
-    if (Serial.available()) {{
+void loop() {
+    sampleAdc();
+    
+    if (adjState != IDLE) {
+        while (Serial.available() && adjState != IDLE) feedAdjust(Serial.read());
+        // With "No line ending" no terminator ever comes: a pause ends the number
+        if (adjState != IDLE && adjDigits && millis() - adjLastByte >= ADJ_IDLE_MS) {
+            finishAdjust();
+        }
+        return;
+    }
+    
+    if (Serial.available()) {
         char cmd = Serial.read();
         while (Serial.available()) Serial.read();
         
-        switch (cmd) {{
+        switch (cmd) {
             case 'r':
             case 'R':
                 readVoltage();
@@ -737,18 +907,13 @@ void loop() {{
             case '2':
                 adjustR2();
                 break;
-        }}
-    }}
-}}
-
-void readVoltage() {{
-    // Take multiple readings for stability
-    long sum = 0;
-    for (int i = 0; i < 10; i++) {{
-        sum += analogRead(ADC_PIN);
-        delay(10);
-    }}
-    float avgRaw = sum / 10.0;
+        }
+    }
+}
+
+void readVoltage() {
+    // Averaged from the running ring (last AVG_N samples)
+    float avgRaw = ringSum / (float)AVG_N;
     
     float vout = (avgRaw * VREF) / ADC_MAX;
     float vin = vout / dividerRatio;
@@ -762,52 +927,113 @@ void readVoltage() {{
     Serial.print("Vin (calculated): ");
     Serial.print(vin, 2);
     Serial.println("V");
-}}
+}
 
-void continuousRead() {{
+void continuousRead() {
     Serial.println("\\nContinuous mode (any key to stop)...");
     
-    while (!Serial.available()) {{
+    char line[48];
+    
+    while (!Serial.available()) {
         int raw = analogRead(ADC_PIN);
         float vout = (raw * VREF) / ADC_MAX;
         float vin = vout / dividerRatio;
         
-        Serial.print("ADC:");
-        Serial.print(raw);
-        Serial.print(" Vout:");
-        Serial.print(vout, 3);
-        Serial.print("V Vin:");
-        Serial.print(vin, 2);
-        Serial.println("V");
+        // Fixed-point parts (AVR snprintf has no %f), one buffered write
+        long mv = (long)(vout * 1000 + 0.5);
+        long cv = (long)(vin * 100 + 0.5);
+        int n = snprintf(line, sizeof(line), "ADC:%d Vout:%ld.%03ldV Vin:%ld.%02ldV\\r\\n",
+                         raw, mv / 1000, mv % 1000, cv / 100, cv % 100);
+        Serial.write((const uint8_t*)line, n);
         
         delay(500);
-    }}
+    }
     while (Serial.available()) Serial.read();
-}}
-
-void adjustR1() {{
-    Serial.println("\\nEnter R1 value in ohms:");
-    while (!Serial.available()) delay(10);
-    R1 = Serial.parseFloat();
-    updateRatio();
-}}
-
-void adjustR2() {{
-    Serial.println("\\nEnter R2 value in ohms:");
-    while (!Serial.available()) delay(10);
-    R2 = Serial.parseFloat();
-    updateRatio();
-}}
-
-void updateRatio() {{
+}
+
+void adjustR1() {
+    Serial.println("\\nEnter R1 value in ohms (any letter cancels):");
+    adjState = READING_R1;
+    adjValue = 0;
+    adjScale = 0;
+    adjDigits = false;
+}
+
+void adjustR2() {
+    Serial.println("\\nEnter R2 value in ohms (any letter cancels):");
+    adjState = READING_R2;
+    adjValue = 0;
+    adjScale = 0;
+    adjDigits = false;
+}
+
+void feedAdjust(char c) {
+    if (c >= '0' && c <= '9') {
+        if (adjScale == 0) {
+            adjValue = adjValue * 10 + (c - '0');
+        } else {
+            adjValue += (c - '0') * adjScale;
+            adjScale *= 0.1;
+        }
+        adjDigits = true;
+        adjLastByte = millis();
+    } else if (c == '.' && adjScale == 0) {
+        adjScale = 0.1;
+        adjLastByte = millis();
+    } else if (c == '\\r' || c == '\\n') {
+        // Blank lines (e.g. the command's own line ending) keep waiting
+        if (adjDigits) finishAdjust();
+    } else if (c != ' ') {
+        // Any other key backs out and keeps the old value
+        adjState = IDLE;
+        Serial.println("Adjustment cancelled");
+    }
+}
+
+void finishAdjust() {
+    if (adjValue > 0) {
+        *(adjState == READING_R1 ? &R1 : &R2) = adjValue;
+        updateRatio();
+    } else {
+        Serial.println("Resistance must be above 0, value unchanged");
+    }
+    adjState = IDLE;
+}
+
+void updateRatio() {
     dividerRatio = R2 / (R1 + R2);
     Serial.print("New ratio: ");
     Serial.println(dividerRatio, 4);
     Serial.print("Max Vin: ");
     Serial.print(VREF / dividerRatio, 2);
     Serial.println("V");
-}}
-'''
+}
+''')
+
+
+# Each Template is split once into literal runs and ${field} names, so
+# rendering is a single join instead of a regex scan per call
+_FIELD_RE = re.compile(r"\$\{(\w+)\}")
+
+
+def _split_template(template: Template) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+    parts = _FIELD_RE.split(template.template)
+    return tuple(parts[0::2]), tuple(parts[1::2])
+
+
+def _render(split: Tuple[Tuple[str, ...], Tuple[str, ...]], **values) -> str:
+    literals, fields = split
+    out = [literals[0]]
+    for name, literal in zip(fields, literals[1:]):
+        out.append(str(values[name]))
+        out.append(literal)
+    return "".join(out)
+
+
+_GPIO_TESTER_SPLIT = _split_template(GPIO_TESTER)
+_ADC_CHECKER_SPLIT = _split_template(ADC_CHECKER)
+_PWM_TESTER_SPLIT = _split_template(PWM_TESTER)
+_VOLTAGE_DIVIDER_SPLIT = _split_template(VOLTAGE_DIVIDER)
 
 
 def generate_i2c_scanner() -> str:
@@ -817,8 +1043,14 @@ def generate_i2c_scanner() -> str:
 
 def generate_gpio_tester(pins: List[int]) -> str:
     """Generate GPIO tester sketch"""
+    return _gpio_tester(tuple(pins))
+
+
+@lru_cache(maxsize=64)
+def _gpio_tester(pins: Tuple[int, ...]) -> str:
     pins_str = ", ".join(map(str, pins))
-    return GPIO_TESTER.format(
+    return _render(
+        _GPIO_TESTER_SPLIT,
         pins=pins_str,
         pins_array=pins_str,
         num_pins=len(pins)
@@ -827,20 +1059,20 @@ def generate_gpio_tester(pins: List[int]) -> str:
 
 def generate_adc_checker(pins: List[str], vref: float = 5.0) -> str:
     """Generate ADC checker sketch"""
-    # Convert pin names to Arduino pin numbers
-    pin_nums = []
-    for p in pins:
-        if p.startswith('A'):
-            pin_nums.append(f"A{p[1:]}")
-        else:
-            pin_nums.append(f"A{p}")
-    
-    pins_str = ", ".join(pins)
-    pins_array = ", ".join(pin_nums)
-    
-    return ADC_CHECKER.format(
+    return _adc_checker(tuple(pins), vref)
+
+
+@lru_cache(maxsize=64, typed=True)
+def _adc_checker(pins: Tuple[str, ...], vref: float) -> str:
+    """Cached body of generate_adc_checker (typed: 5 and 5.0 render differently)"""
+    # Normalize to Arduino analog pin names ("0" -> "A0"); one string serves
+    # both the header comment and the pin array
+    pins_str = ", ".join([p if p.startswith('A') else f"A{p}" for p in pins])
+    
+    return _render(
+        _ADC_CHECKER_SPLIT,
         pins=pins_str,
-        pins_array=pins_array,
+        pins_array=pins_str,
         num_pins=len(pins),
         vref=vref
     )
@@ -848,8 +1080,14 @@ def generate_adc_checker(pins: List[str], vref: float = 5.0) -> str:
 
 def generate_pwm_tester(pins: List[int]) -> str:
     """Generate PWM tester sketch"""
+    return _pwm_tester(tuple(pins))
+
+
+@lru_cache(maxsize=64)
+def _pwm_tester(pins: Tuple[int, ...]) -> str:
     pins_str = ", ".join(map(str, pins))
-    return PWM_TESTER.format(
+    return _render(
+        _PWM_TESTER_SPLIT,
         pins=pins_str,
         pins_array=pins_str,
         num_pins=len(pins)
@@ -861,10 +1099,13 @@ def generate_serial_loopback() -> str:
     return SERIAL_LOOPBACK
 
 
+# typed: vref/r1/r2 of 5 and 5.0 render differently
+@lru_cache(maxsize=64, typed=True)
 def generate_voltage_divider(adc_pin: str = "A0", vref: float = 5.0, 
                               r1: float = 30000, r2: float = 7500) -> str:
     """Generate voltage divider calculator sketch"""
-    return VOLTAGE_DIVIDER.format(
+    return _render(
+        _VOLTAGE_DIVIDER_SPLIT,
         adc_pin=adc_pin,
         vref=vref,
         r1=r1,
@@ -929,16 +1170,19 @@ def interactive_mode():
         filename = "voltage_divider.ino"
         
     elif choice == "7":
-        # Generate all into one file
-        sketches = [
-            "// ===== I2C SCANNER =====",
-            generate_i2c_scanner(),
-            "\n// ===== GPIO TESTER =====",
-            generate_gpio_tester([2, 3, 4, 5]),
-            "\n// ===== ADC CHECKER =====",
-            generate_adc_checker(["A0", "A1", "A2"]),
+        # Generate all into one file, each section under a banner comment
+        sections = [
+            ("I2C SCANNER", generate_i2c_scanner()),
+            ("GPIO TESTER", generate_gpio_tester([2, 3, 4, 5])),
+            ("ADC CHECKER", generate_adc_checker(["A0", "A1", "A2"])),
         ]
-        sketch = "\n\n".join(sketches)
+        buf = io.StringIO()
+        for i, (label, section) in enumerate(sections):
+            if i:
+                buf.write("\n\n\n")
+            buf.write(f"// ===== {label} =====\n\n")
+            buf.write(section)
+        sketch = buf.getvalue()
         filename = "debug_suite.ino"
         print("\nNote: Multiple sketches generated. Copy desired section to use.")
     
@@ -951,8 +1195,7 @@ def interactive_mode():
     if custom_name:
         filename = custom_name if custom_name.endswith(".ino") else custom_name + ".ino"
     
-    with open(filename, 'w') as f:
-        f.write(sketch)
+    Path(filename).write_text(sketch, encoding="utf-8")
     
     print(f"\n✓ Generated: {filename}")
     print(f"  Upload to Arduino and open Serial Monitor at 115200 baud")
@@ -1014,16 +1257,14 @@ def main():
         names = ["i2c_scanner.ino", "gpio_tester.ino", "adc_checker.ino", 
                  "pwm_tester.ino", "serial_loopback.ino"]
         for s, n in zip(sketches, names):
-            with open(n, 'w') as f:
-                f.write(s)
+            Path(n).write_text(s, encoding="utf-8")
             print(f"Generated: {n}")
         return
     else:
         parser.print_help()
         return
     
-    with open(filename, 'w') as f:
-        f.write(sketch)
+    Path(filename).write_text(sketch, encoding="utf-8")
     print(f"Generated: {filename}")
 
 